@@ -3,7 +3,7 @@ from discord.ext import commands
 import os
 import random
 from config import config, get_logger
-from utils.supabase_client import get_server_config, update_user_economy
+from utils.supabase_client import get_server_config, update_user_economy, close_http_client, warm_server_config_cache, MONEY_DROP_FALLBACKS
 from typing import List, Union
 logger = get_logger()
 
@@ -99,11 +99,11 @@ async def on_message(message: discord.Message) -> None:
             guild_id = message.guild.id
             server_config = await get_server_config(guild_id)
             eco_config = server_config.get('economy', {})
-            drop_config = server_config.get('moneydrop', {})
+            drop_config = {**MONEY_DROP_FALLBACKS, **server_config.get('moneydrop', {})} # Same fallbacks the config menu shows.
 
             # Check if money drops are enabled and if a random chance condition is met.
-            if drop_config.get('enabled') and random.random() < drop_config.get('chance', 0.05):
-                allowed_channels = drop_config.get('allowed_channels', [])
+            if drop_config['enabled'] and random.random() < drop_config['chance']:
+                allowed_channels = drop_config['allowed_channels']
 
                 if allowed_channels == ["-1"]: # If explicitly disallowed.
                     logger.debug(f"Money drop disallowed in all channels for guild {guild_id}.")
@@ -114,7 +114,7 @@ async def on_message(message: discord.Message) -> None:
                         # Import DropView locally to avoid circular dependencies between cogs and bot.py.
                         from cogs.moneydrops import DropView
                         # Determine the random amount for the money drop.
-                        amount = random.randint(drop_config.get('min_amount', 50), drop_config.get('max_amount', 250))
+                        amount = random.randint(drop_config['min_amount'], drop_config['max_amount'])
                         symbol = eco_config.get('currency_symbol', '£')
 
                         # Create and send an embed message with a "Claim!" button.
@@ -173,6 +173,8 @@ async def on_command_error(ctx: commands.Context, error: commands.CommandError)
         await ctx.send("You provided an invalid argument. Use the help command for more info.")
     elif isinstance(error, commands.CommandOnCooldown):
         await ctx.send(f"This command is on cooldown. Try again in {error.retry_after:.2f} seconds.")
+    elif isinstance(error, commands.NoPrivateMessage): # Must come before CheckFailure, its parent class.
+        await ctx.send("This command can only be used in a server.")
     elif isinstance(error, commands.CheckFailure):
         await ctx.send("You don't have permission to use this command.")
     else:
@@ -200,6 +202,12 @@ async def main() -> None:
     Main function to run the bot.
     Initializes cogs and starts the Discord bot client.
     """
-    async with bot:
-        await load_cogs() # Load all bot functionalities.
-        await bot.start(config.DISCORD_BOT_TOKEN)
\ No newline at end of file
+    try:
+        async with bot:
+            await load_cogs() # Load all bot functionalities.
+            # Preload configs so the first prefix lookups after startup don't hit the database.
+            # Done here rather than in on_ready, which fires again on every reconnect.
+            await warm_server_config_cache()
+            await bot.start(config.DISCORD_BOT_TOKEN)
+    finally:
+        close_http_client() # Release pooled Supabase connections.
\ No newline at end of file
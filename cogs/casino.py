@@ -13,7 +13,7 @@ class CasinoCog(commands.Cog, name="Casino"):
         self.active_games: Dict[int, Optional[discord.Message]] = {}
 
     @commands.command(name='roulette', aliases=['r'])
-    @guild_only()
+    @commands.guild_only()
     @in_allowed_channels()
     async def roulette(self, ctx: commands.Context, *, bet_str: str):
         """Starts a game of roulette.
@@ -123,7 +123,7 @@ class CasinoCog(commands.Cog, name="Casino"):
                 self.active_games.pop(user_id)
 
     @commands.command(name='blackjack', aliases=['bj', '21'])
-    @guild_only()
+    @commands.guild_only()
     @in_allowed_channels()
     async def blackjack(self, ctx: commands.Context, *, bet_str: str) -> None:
         """Starts a game of blackjack against the dealer.
@@ -1,74 +1,94 @@
+import asyncio
+import math
+import re
 import discord
 from discord.ext import commands
-from utils.supabase_client import get_server_config, get_user_economy_data, update_server_config, ServerConfig
+from utils.supabase_client import get_server_config, get_user_economy_data, update_server_config, modify_server_config, ServerConfig, MONEY_DROP_FALLBACKS
 from utils.helpers import *
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
-def get_allowed_str(bot: commands.Bot, channels: List[str]):
-    """Formats a list of channel IDs into a user-friendly string."""
+def get_allowed_str(guild: discord.Guild, channels: List[str]):
+    """Formats a list of channel IDs in `guild` into a user-friendly string."""
     if not channels:
         return "All channels currently allowed." # If empty, all are allowed.
     elif channels == ["-1"]:
         return "All channels currently disallowed." # If "-1", none are allowed.
     else:
         # Format channel mentions for display, filtering out invalid channel IDs.
-        general_channels_list = [f"<#{_id}>" for _id in channels if bot.get_channel(int(_id))]
-        return "\n".join(general_channels_list) if general_channels_list else "No valid channels set."
+        return "\n".join(f"<#{_id}>" for _id in channels if guild.get_channel(int(_id))) or "No valid channels set."
+
+def toggle_channel(channels: List[str], channel_id: str) -> Tuple[List[str], bool]:
+    """Adds `channel_id` to `channels` if it's missing, otherwise removes it. Returns the new list and whether it was added."""
+    # A dict keeps the stored order while making the membership test and removal O(1). Drops the "-1" (none allowed) marker.
+    selected = dict.fromkeys(_id for _id in channels if _id != "-1")
+    if added := channel_id not in selected:
+        selected[channel_id] = None
+    else:
+        del selected[channel_id]
+    return list(selected), added
+
+async def resolve_text_channel(ctx: commands.Context, channel_args: Union[discord.TextChannel, str]) -> Optional[discord.TextChannel]:
+    """Resolves a channel argument, looking strings up by name. Tells the user and returns None if it isn't found."""
+    assert ctx.guild is not None
+    if not isinstance(channel_args, str):
+        return channel_args
+
+    # If a string is provided, try to find the channel by name.
+    channel = discord.utils.get(ctx.guild.text_channels, name=channel_args)
+    if not channel:
+        await ctx.send(f"Channel '{channel_args}' not found.")
+    return channel
 
 class ConfigCog(commands.Cog, name="Configuration"):
     """Cog for all configuration-related commands."""
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # Registered once, the menu buttons dispatch from their custom IDs on every config message, including ones sent before a restart.
+        bot.add_dynamic_items(ConfigMenuButton)
+
+    def cog_unload(self) -> None:
+        self.bot.remove_dynamic_items(ConfigMenuButton)
 
     @commands.command(name="config")
-    @guild_only()
+    @commands.guild_only()
     @commands.has_permissions(administrator=True)
     async def config_command(self, ctx: commands.Context):
         """Displays the main configuration menu."""
-        view = ConfigMainMenuView(ctx, self)
-        embed = await view.update_embed("general")
-        view.message = await ctx.send(embed=embed, view=view)
+        assert ctx.guild is not None
+        embed = await build_config_embed(ctx.guild, ctx.author, "general")
+        await ctx.send(embed=embed, view=ConfigMainMenuView("general", ctx.author.id))
 
     @commands.command(name="setchannels", aliases=["sc", "setc"])
-    @guild_only()
+    @commands.guild_only()
     @commands.has_permissions(administrator=True)
     async def setchannels(self, ctx: commands.Context, channel_args: Union[discord.TextChannel, str]):
         """Add or remove a channel from the allowed list."""
         assert ctx.guild is not None
 
-        old_config = await get_server_config(ctx.guild.id)
-
+        channel: Optional[discord.TextChannel] = None
         if isinstance(channel_args, str) and channel_args.lower() in ("all", "none"):
             if channel_args == "none":
-                current_channels = ["-1"]
+                fixed_channels = ["-1"]
                 feedback = "Bot commands are now disallowed in all channels."
             else:
-                current_channels = []
+                fixed_channels = []
                 feedback = "Bot commands are now allowed in all channels."
-        else:
-            if isinstance(channel_args, str):
-                # If a string is provided, try to find the channel by name.
-                channel = discord.utils.get(ctx.guild.text_channels, name=channel_args)
-                if not channel:
-                    await ctx.send(f"Channel '{channel_args}' not found.")
-                    return
-            else:
-                channel = channel_args
-
-            current_channels = old_config.get("allowed_channels", []).copy()
-            channel_id_str = str(channel.id)
+        elif not (channel := await resolve_text_channel(ctx, channel_args)):
+            return
 
-            if current_channels == ["-1"]:
-                current_channels = []
+        def set_channels(config: ServerConfig) -> Dict[str, Any]:
+            # Toggled against the config read under the write lock, so concurrent toggles don't drop each other.
+            if channel is None:
+                return {"allowed_channels": fixed_channels}
+            return {"allowed_channels": toggle_channel(config.get("allowed_channels", []), str(channel.id))[0]}
 
-            if channel_id_str in current_channels:
-                current_channels.remove(channel_id_str)
-                feedback = f"Removed {channel.mention} from the allowed channels."
-            else:
-                current_channels.append(channel_id_str)
+        old_config, update_data = await modify_server_config(ctx.guild.id, set_channels)
+        current_channels: List[str] = update_data["allowed_channels"]
+        if channel is not None:
+            if str(channel.id) in current_channels:
                 feedback = f"Added {channel.mention} to the allowed channels."
-                
-        await update_server_config(ctx.guild.id, {"allowed_channels":current_channels})
+            else:
+                feedback = f"Removed {channel.mention} from the allowed channels."
         await send_embed(ctx, feedback)
         if log_channel_id := old_config.get("config_log"):
             await post_config_log(self.bot, 
@@ -76,50 +96,41 @@ class ConfigCog(commands.Cog, name="Configuration"):
                                   log_channel_id, 
                                   ctx.author, #type: ignore
                                   "allowed_channels", 
-                                  get_allowed_str(self.bot, old_config.get("allowed_channels", [])), 
-                                  get_allowed_str(self.bot, current_channels)
+                                  get_allowed_str(ctx.guild, old_config.get("allowed_channels", [])), 
+                                  get_allowed_str(ctx.guild, current_channels)
             )
 
     @commands.command(name="setmoneydropchannels", aliases=["smdc", "setmdc"])
-    @guild_only()
+    @commands.guild_only()
     @commands.has_permissions(administrator=True)
     async def setmoneydropchannels(self, ctx: commands.Context, channel_args: Union[discord.TextChannel, str]):
         """Add or remove a channel from the money drop allowed list."""
         assert ctx.guild is not None
 
-        old_config = await get_server_config(ctx.guild.id)
-
+        channel: Optional[discord.TextChannel] = None
         if isinstance(channel_args, str) and channel_args.lower() in ("all", "none"):
             if channel_args == "none":
-                current_channels = ["-1"]
+                fixed_channels = ["-1"]
                 feedback = "Money drops are now disallowed in all channels."
             else:
-                current_channels = []
+                fixed_channels = []
                 feedback = "Money drops are now allowed in all channels."
-        else:
-            if isinstance(channel_args, str):
-                # If a string is provided, try to find the channel by name.
-                channel = discord.utils.get(ctx.guild.text_channels, name=channel_args)
-                if not channel:
-                    await ctx.send(f"Channel '{channel_args}' not found.")
-                    return
-            else:
-                channel = channel_args
-
-            current_channels = old_config.get("moneydrop", {}).get("allowed_channels", []).copy()
-            channel_id_str = str(channel.id)
+        elif not (channel := await resolve_text_channel(ctx, channel_args)):
+            return
 
-            if current_channels == ["-1"]:
-                current_channels = []
+        def set_channels(config: ServerConfig) -> Dict[str, Any]:
+            if channel is None:
+                return {"moneydrop": {"allowed_channels": fixed_channels}}
+            channels = config.get("moneydrop", {}).get("allowed_channels", [])
+            return {"moneydrop": {"allowed_channels": toggle_channel(channels, str(channel.id))[0]}}
 
-            if channel_id_str in current_channels:
-                current_channels.remove(channel_id_str)
-                feedback = f"Removed {channel.mention} from the allowed moneydrop channels."
-            else:
-                current_channels.append(channel_id_str)
+        old_config, update_data = await modify_server_config(ctx.guild.id, set_channels)
+        current_channels: List[str] = update_data["moneydrop"]["allowed_channels"]
+        if channel is not None:
+            if str(channel.id) in current_channels:
                 feedback = f"Added {channel.mention} to the allowed moneydrop channels."
-
-        await update_server_config(ctx.guild.id, {"moneydrop":{"allowed_channels": current_channels}})
+            else:
+                feedback = f"Removed {channel.mention} from the allowed moneydrop channels."
         await send_embed(ctx, feedback)
         if log_channel_id := old_config.get("config_log"):
             await post_config_log(self.bot, 
@@ -127,12 +138,12 @@ class ConfigCog(commands.Cog, name="Configuration"):
                                   log_channel_id, 
                                   ctx.author, #type: ignore
                                   "moneydrop_allowed_channels", 
-                                  get_allowed_str(self.bot, old_config.get("moneydrop", {}).get("allowed_channels", [])), 
-                                  get_allowed_str(self.bot, current_channels)
+                                  get_allowed_str(ctx.guild, old_config.get("moneydrop", {}).get("allowed_channels", [])), 
+                                  get_allowed_str(ctx.guild, current_channels)
             )
     
     @commands.command(name="setupdatechannel", aliases=["suc", "setuc"])
-    @guild_only()
+    @commands.guild_only()
     @commands.has_permissions(administrator=True)
     async def setupdatechannel(self, ctx: commands.Context, channel_args: Union[discord.TextChannel, str]):
         """Set a channel to receive update logs for the bot"""
@@ -144,14 +155,8 @@ class ConfigCog(commands.Cog, name="Configuration"):
             channel = None
             feedback = "Update logs are now disabled."
         else:
-            if isinstance(channel_args, str):
-                # If a string is provided, try to find the channel by name.
-                channel = discord.utils.get(ctx.guild.text_channels, name=channel_args)
-                if not channel:
-                    await ctx.send(f"Channel '{channel_args}' not found.")
-                    return
-            else:
-                channel = channel_args
+            if not (channel := await resolve_text_channel(ctx, channel_args)):
+                return
             feedback = f"Set {channel.mention} to the update log channel."
 
         await update_server_config(ctx.guild.id, {"update_log":str(channel.id) if channel else None})
@@ -167,7 +172,7 @@ class ConfigCog(commands.Cog, name="Configuration"):
             )
 
     @commands.command(name="setconfigchannel", aliases=["scc", "setcc"])
-    @guild_only()
+    @commands.guild_only()
     @commands.has_permissions(administrator=True)
     async def setconfigchannel(self, ctx: commands.Context, channel_args: Union[discord.TextChannel, str]):
         """Set a channel to receive the configuration log for the bot"""
@@ -179,14 +184,8 @@ class ConfigCog(commands.Cog, name="Configuration"):
             channel = None
             feedback = "Configuration Logs are now disabled."
         else:
-            if isinstance(channel_args, str):
-                # If a string is provided, try to find the channel by name.
-                channel = discord.utils.get(ctx.guild.text_channels, name=channel_args)
-                if not channel:
-                    await ctx.send(f"Channel '{channel_args}' not found.")
-                    return
-            else:
-                channel = channel_args
+            if not (channel := await resolve_text_channel(ctx, channel_args)):
+                return
             feedback = f"Set {channel.mention} to the configuration log channel."
 
         await update_server_config(ctx.guild.id, {"config_log": str(channel.id) if channel else None})
@@ -202,7 +201,7 @@ class ConfigCog(commands.Cog, name="Configuration"):
             )
         
     @commands.command(name="setmoneychannel", aliases=["smc", "setmc"])
-    @guild_only()
+    @commands.guild_only()
     @commands.has_permissions(administrator=True)
     async def setmoneychannel(self, ctx: commands.Context, channel_args: Union[discord.TextChannel, str]):
         """Set a channel to receive the money log for the bot"""
@@ -214,14 +213,8 @@ class ConfigCog(commands.Cog, name="Configuration"):
             channel = None
             feedback = "Configuration Logs are now disabled."
         else:
-            if isinstance(channel_args, str):
-                # If a string is provided, try to find the channel by name.
-                channel = discord.utils.get(ctx.guild.text_channels, name=channel_args)
-                if not channel:
-                    await ctx.send(f"Channel '{channel_args}' not found.")
-                    return
-            else:
-                channel = channel_args
+            if not (channel := await resolve_text_channel(ctx, channel_args)):
+                return
             feedback = f"Set {channel.mention} to the money log channel."
 
         await update_server_config(ctx.guild.id, {"economy":{"log_channel": str(channel.id) if channel else None}})
@@ -237,13 +230,16 @@ class ConfigCog(commands.Cog, name="Configuration"):
             )
 
     @commands.command(name="settiktok", aliases=["settt", "stt"])
-    @guild_only()
+    @commands.guild_only()
     @commands.has_permissions(administrator=True)
     async def set_tiktok(self, ctx: commands.Context):
         """Sets the TikTok username for the server to watch for live events."""
         assert ctx.guild is not None
-        old_config = await get_server_config(ctx.guild.id)
-        user_data = await get_user_economy_data(ctx.guild.id, ctx.author.id)  # Ensure the user has an economy entry
+        # Fetch the config and the user's economy entry (creating it if needed) concurrently.
+        old_config, user_data = await asyncio.gather(
+            get_server_config(ctx.guild.id),
+            get_user_economy_data(ctx.guild.id, ctx.author.id)
+        )
 
         if user_data and user_data.get("tiktok").get("id"):
             tiktok_username = user_data["tiktok"]["username"]
@@ -263,167 +259,217 @@ class ConfigCog(commands.Cog, name="Configuration"):
         else:
             await send_embed(ctx, "❌ **TikTok Stream Not Found!** Please ensure you have a TikTok account linked to your profile.")
         
-class ConfigMainMenuView(discord.ui.View):
-    """The main view for navigating and editing bot configurations."""
-    def __init__(self, ctx: commands.Context, cog: ConfigCog) -> None:
-        super().__init__(timeout=300)
-        self.ctx = ctx
-        self.bot = ctx.bot
-        self.cog = cog
-        self.message: Optional[discord.Message] = None
-        self.current_section = "general"
+# --- Config Menu Section Renderers ---
+# Each one adds its section's fields to the embed built by `build_config_embed`.
+
+def render_general_settings(guild: discord.Guild, config: ServerConfig, embed: discord.Embed) -> None:
+    update_log, config_log, money_log = config.get('update_log'), config.get('config_log'), config.get('economy', {}).get('log_channel')
+    embed.add_field(name="Prefix", value=f"`{config.get('prefix', '-')}`")
+    embed.add_field(name="Embed Color", value=f"`{config.get('embed_color', '#0000FF')}`")
+    embed.add_field(name="Allowed Channels", value=get_allowed_str(guild, config.get("allowed_channels", [])), inline=False)
+    embed.add_field(name="Bot Log Channel", value=f"<#{update_log}>" if update_log else "Not set")
+    embed.add_field(name="Config Log Channel", value=f"<#{config_log}>" if config_log else "Not set")
+    embed.add_field(name="Money Log Channel", value=f"<#{money_log}>" if money_log else "Not set")
+
+def render_currency_settings(guild: discord.Guild, config: ServerConfig, embed: discord.Embed) -> None:
+    eco = config.get('economy', {})
+    embed.add_field(name="Name", value=f"{eco['currency_name']}")
+    embed.add_field(name="Symbol", value=f"{eco['currency_symbol']}")
+    embed.add_field(name="Starting Balance", value=f"{format_currency_from_config(config, eco['starting_balance'])}")
+
+def render_work_settings(guild: discord.Guild, config: ServerConfig, embed: discord.Embed) -> None:
+    eco = config.get('economy', {})
+    embed.add_field(name="Cooldown", value=f"{eco['work_cooldown_hours']}h")
+    embed.add_field(name="Range", value=f"{format_currency_from_config(config, eco['work_min_amount'])} - {format_currency_from_config(config, eco['work_max_amount'])}")
+
+def render_steal_settings(guild: discord.Guild, config: ServerConfig, embed: discord.Embed) -> None:
+    eco = config.get('economy', {})
+    embed.add_field(name="Cooldown", value=f"{eco['steal_cooldown_hours']}h")
+    embed.add_field(name="Chance", value=f"{eco['steal_chance'] * 100:.0f}%")
+    embed.add_field(name="Penalty", value=f"{eco['currency_symbol']}{eco['steal_penalty']}")
+    embed.add_field(name="Max %", value=f"{eco['steal_max_percentage'] * 100:.0f}%")
+
+def render_moneydrop_settings(guild: discord.Guild, config: ServerConfig, embed: discord.Embed) -> None:
+    drop = {**MONEY_DROP_FALLBACKS, **config.get('moneydrop', {})} # Fill in any missing settings the way money drops do.
+    embed.add_field(name="Enabled", value=f"{drop['enabled']}")
+    embed.add_field(name="Chance", value=f"{drop['chance'] * 100:.0f}%")
+    embed.add_field(name="Range", value=f"{format_currency_from_config(config, drop['min_amount'])} - {format_currency_from_config(config, drop['max_amount'])}")
+    embed.add_field(name="Channels", value=get_allowed_str(guild, drop["allowed_channels"]), inline=False)
+
+# Section name -> (embed title, renderer)
+SECTION_RENDERERS: Dict[str, Tuple[str, Callable[[discord.Guild, ServerConfig, discord.Embed], None]]] = {
+    "general": ("General Settings", render_general_settings),
+    "currency": ("Currency Settings", render_currency_settings),
+    "work": ("Work Settings", render_work_settings),
+    "steal": ("Steal Settings", render_steal_settings),
+    "moneydrop": ("Money Drop Settings", render_moneydrop_settings),
+}
+# Section name -> the label of the menu button that shows it.
+SECTION_LABELS: Dict[str, str] = {
+    "general": "General",
+    "currency": "Currency",
+    "work": "Work",
+    "steal": "Steal",
+    "moneydrop": "Money Drop",
+}
+
+async def build_config_embed(guild: discord.Guild, user: Union[discord.User, discord.Member], section: str) -> discord.Embed:
+    """Builds the embed displaying the specified configuration section."""
+    config = await get_server_config(guild.id)
+    color = get_embed_color_from_config(config)
+    title, render = SECTION_RENDERERS.get(section, ("Configuration", None))
+    embed = discord.Embed(title=title, color=color)
+    if render:
+        render(guild, config, embed)
+    else:
+        embed.description = "Invalid section."
+    embed.set_footer(text=user.display_name, icon_url=user.display_avatar.url if user.avatar else None)    
+    return embed
+
+class ConfigMenuButton(discord.ui.DynamicItem[discord.ui.Button], template=r"config:(?P<action>show|edit):(?P<section>[a-z]+):(?P<author_id>[0-9]+)"):
+    """
+    A config menu button. Its action, the section it acts on and the user who opened the menu are all kept in its custom ID,
+    so one registration serves every menu message, including ones sent before a restart.
+    """
+    def __init__(self, action: str, section: str, author_id: int) -> None:
+        self.action = action
+        self.section = section
+        self.author_id = author_id
+        if action == "edit":
+            label, style = "Edit", discord.ButtonStyle.secondary
+        else:
+            label, style = SECTION_LABELS.get(section, section), discord.ButtonStyle.primary
+        super().__init__(discord.ui.Button(label=label, style=style, custom_id=f"config:{action}:{section}:{author_id}"))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match: re.Match[str]) -> "ConfigMenuButton":
+        return cls(match["action"], match["section"], int(match["author_id"]))
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        """Ensures only the command author can interact with the view."""
-        return interaction.user.id == self.ctx.author.id
-
-    async def update_embed(self, section: str) -> discord.Embed:
-        """Updates the embed to display the specified configuration section."""
-        assert self.ctx.guild is not None
-        self.current_section = section
-        config = await get_server_config(self.ctx.guild.id)
-        color = await get_embed_color(self.ctx.guild.id)
-        eco = config.get('economy', {})
-        drop = config.get('moneydrop', {})
+        """Ensures only the user who opened the menu can interact with it."""
+        if interaction.user.id == self.author_id:
+            return True
+        await interaction.response.send_message("Only the person who opened this menu can use it.", ephemeral=True)
+        return False
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        assert interaction.guild is not None
+        if self.action == "edit":
+            # Opens the appropriate modal to edit the section the menu message is showing.
+            if not (modal_class := SECTION_MODALS.get(self.section)):
+                return
+            config = await get_server_config(interaction.guild.id)
+            await interaction.response.send_modal(modal_class(cast(commands.Bot, interaction.client), interaction.guild, config))
+            return
 
-        if section == "general":
-            embed = discord.Embed(title="General Settings", color=color)
-            embed.add_field(name="Prefix", value=f"`{config.get('prefix', '!')}`")
-            embed.add_field(name="Embed Color", value=f"`{config.get('embed_color', '#0000FF')}`")
-            embed.add_field(name="Allowed Channels", value=get_allowed_str(self.bot, config.get("allowed_channels", [])), inline=False)
-            embed.add_field(name="Bot Log Channel", value=f"<#{config.get('update_log')}>" if config.get('update_log') else "Not set")
-            embed.add_field(name="Config Log Channel", value=f"<#{config.get('config_log')}>" if config.get('config_log') else "Not set")
-            embed.add_field(name="Money Log Channel", value=f"<#{eco.get('log_channel')}>" if eco.get('log_channel') else "Not set")
-        elif section == "currency":
-            embed = discord.Embed(title="Currency Settings", color=color)
-            embed.add_field(name="Name", value=f"{eco['currency_name']}")
-            embed.add_field(name="Symbol", value=f"{eco['currency_symbol']}")
-            embed.add_field(name="Starting Balance", value=f"{await format_currency(self.ctx.guild.id, eco['starting_balance'])}")
-        elif section == "work":
-            embed = discord.Embed(title="Work Settings", color=color)
-            embed.add_field(name="Cooldown", value=f"{eco['work_cooldown_hours']}h")
-            embed.add_field(name="Range", value=f"{await format_currency(self.ctx.guild.id, eco['work_min_amount'])} - {await format_currency(self.ctx.guild.id, eco['work_max_amount'])}")
-        elif section == "steal":
-            embed = discord.Embed(title="Steal Settings", color=color)
-            embed.add_field(name="Cooldown", value=f"{eco['steal_cooldown_hours']}h")
-            embed.add_field(name="Chance", value=f"{eco['steal_chance'] * 100:.0f}%")
-            embed.add_field(name="Penalty", value=f"{eco['currency_symbol']}{eco['steal_penalty']}")
-            embed.add_field(name="Max %", value=f"{eco['steal_max_percentage'] * 100:.0f}%")
-        elif section == "moneydrop":
-            embed = discord.Embed(title="Money Drop Settings", color=color)
-            embed.add_field(name="Enabled", value=f"{drop.get('enabled', False)}")
-            embed.add_field(name="Chance", value=f"{drop.get('chance', 0.05) * 100:.0f}%")
-            embed.add_field(name="Range", value=f"{await format_currency(self.ctx.guild.id, drop.get('min_amount', 50))} - {await format_currency(self.ctx.guild.id, drop.get('max_amount', 250))}")
-            embed.add_field(name="Channels", value=get_allowed_str(self.bot, drop.get("allowed_channels", [])), inline=False)
-        else:
-            embed = discord.Embed(title="Configuration", description="Invalid section.", color=color)
-        embed.set_footer(text=self.ctx.author.display_name, icon_url=self.ctx.author.display_avatar.url if self.ctx.author.avatar else None)    
-        return embed
-
-    @discord.ui.button(label="General", style=discord.ButtonStyle.primary, custom_id="config:general")
-    async def general(self, interaction: discord.Interaction, _: discord.ui.Button):
-        embed = await self.update_embed("general")
-        await interaction.response.edit_message(embed=embed, view=self)
-
-    @discord.ui.button(label="Currency", style=discord.ButtonStyle.primary, custom_id="config:currency")
-    async def currency(self, interaction: discord.Interaction, _: discord.ui.Button):
-        embed = await self.update_embed("currency")
-        await interaction.response.edit_message(embed=embed, view=self)
-
-    @discord.ui.button(label="Work", style=discord.ButtonStyle.primary, custom_id="config:work")
-    async def work(self, interaction: discord.Interaction, _: discord.ui.Button):
-        embed = await self.update_embed("work")
-        await interaction.response.edit_message(embed=embed, view=self)
-
-    @discord.ui.button(label="Steal", style=discord.ButtonStyle.primary, custom_id="config:steal")
-    async def steal(self, interaction: discord.Interaction, _: discord.ui.Button):
-        embed = await self.update_embed("steal")
-        await interaction.response.edit_message(embed=embed, view=self)
-
-    @discord.ui.button(label="Money Drop", style=discord.ButtonStyle.primary, custom_id="config:moneydrop")
-    async def moneydrop(self, interaction: discord.Interaction, _: discord.ui.Button):
-        embed = await self.update_embed("moneydrop")
-        await interaction.response.edit_message(embed=embed, view=self)
-
-    @discord.ui.button(label="Edit", style=discord.ButtonStyle.secondary, custom_id="config:edit")
-    async def edit(self, interaction: discord.Interaction, _: discord.ui.Button):
-        """Opens the appropriate modal to edit the current section."""
-        assert self.ctx.guild is not None
-        config = await get_server_config(self.ctx.guild.id)
-        
-        modals = {
-            "general": GeneralSettingsModal(self.ctx, self, config),
-            "currency": CurrencySettingsModal(self.ctx, self, config),
-            "work": WorkSettingsModal(self.ctx, self, config),
-            "steal": StealSettingsModal(self.ctx, self, config),
-            "moneydrop": MoneyDropSettingsModal(self.ctx, self, config)
-        }
-        
-        if modal := modals.get(self.current_section):
-            await interaction.response.send_modal(modal)
-    
-    async def on_timeout(self) -> None:
-        """
-        Called when the view times out (i.e., no one clicks the button within the timeout period).
-        Updates the message to indicate the drop went unclaimed and disables the button.
-        """
-        if self.message:
-            await self.message.edit(view=None)
+        # Acknowledge first so a slow config fetch can't run past Discord's 3 second response window.
+        await interaction.response.defer()
+        embed = await build_config_embed(interaction.guild, interaction.user, self.section)
+        await interaction.edit_original_response(embed=embed, view=ConfigMainMenuView(self.section, self.author_id))
+
+class ConfigMainMenuView(discord.ui.View):
+    """The buttons of a config menu message showing `section`, opened by the user `author_id`."""
+    def __init__(self, section: str, author_id: int) -> None:
+        super().__init__(timeout=None)
+        for menu_section in SECTION_LABELS:
+            self.add_item(ConfigMenuButton("show", menu_section, author_id))
+        self.add_item(ConfigMenuButton("edit", section, author_id))
 
 # --- Modals for Editing Configuration ---
 
+PREFIX_RE = re.compile(r"(?!\d+$).{1,10}") # 1 to 10 characters, not all digits.
+HEX_COLOR_RE = re.compile(r"#?[0-9a-fA-F]{6}")
+TRUTHY_VALUES = frozenset({"true", "1", "yes", "on"})
+FALSY_VALUES = frozenset({"false", "0", "no", "off"})
+
+# (setting, display name, type, maximum) for each numeric modal input, by section. All of them must be non-negative.
+SETTING_SCHEMAS: Dict[str, Tuple[Tuple[str, str, type, float], ...]] = {
+    "currency": (
+        ("starting_balance", "Starting balance", int, math.inf),
+    ),
+    "work": (
+        ("work_cooldown_hours", "Cooldown hours", int, math.inf),
+        ("work_min_amount", "Min amount", int, math.inf),
+        ("work_max_amount", "Max amount", int, math.inf),
+    ),
+    "steal": (
+        ("steal_cooldown_hours", "Cooldown hours", int, math.inf),
+        ("steal_chance", "Steal chance", float, 1.0),
+        ("steal_penalty", "Steal penalty", int, math.inf),
+        ("steal_max_percentage", "Steal max percentage", float, 1.0),
+    ),
+    "moneydrop": (
+        ("chance", "Chance", float, 1.0),
+        ("min_amount", "Min amount", int, math.inf),
+        ("max_amount", "Max amount", int, math.inf),
+    ),
+}
+# (min setting, max setting) for sections with an amount range.
+SETTING_RANGES: Dict[str, Tuple[str, str]] = {
+    "work": ("work_min_amount", "work_max_amount"),
+    "moneydrop": ("min_amount", "max_amount"),
+}
+
+def parse_settings(section: str, modal: discord.ui.Modal) -> Dict[str, Any]:
+    """Parses and validates a modal's numeric inputs against the section's schema. Raises `ValueError` with a user-facing message."""
+    settings: Dict[str, Any] = {}
+    for setting, name, type_, maximum in SETTING_SCHEMAS[section]:
+        try:
+            value = type_(getattr(modal, setting).value)
+        except ValueError:
+            raise ValueError(f"{name} must be a valid number.")
+        if not (0 <= value <= maximum): # Also rejects NaN.
+            raise ValueError(f"{name} must be between 0.0 and {maximum}." if maximum != math.inf else f"{name} must be non-negative.")
+        settings[setting] = value
+
+    if section in SETTING_RANGES:
+        min_setting, max_setting = SETTING_RANGES[section]
+        if settings[min_setting] > settings[max_setting]:
+            raise ValueError("Min amount cannot be greater than max amount.")
+    return settings
+
 class GeneralSettingsModal(discord.ui.Modal, title="Edit General Settings"):
-    def __init__(self, ctx: commands.Context, parent_view: ConfigMainMenuView, config: ServerConfig):
+    def __init__(self, bot: commands.Bot, guild: discord.Guild, config: ServerConfig):
         super().__init__()
-        self.ctx = ctx
-        self.parent_view = parent_view
+        self.bot = bot
+        self.guild = guild
         
-        self.prefix = discord.ui.TextInput(label="Prefix", default=config.get('prefix', '!'))
+        self.prefix = discord.ui.TextInput(label="Prefix", default=config.get('prefix', '-'))
         self.embed_color = discord.ui.TextInput(label="Embed Color", default=config.get('embed_color', '#0000FF'))
         self.add_item(self.prefix)
         self.add_item(self.embed_color)
 
     async def on_submit(self, interaction: discord.Interaction):
-        assert self.ctx.guild is not None, "This command can only be used in a guild."
-
-        old_config = await get_server_config(self.ctx.guild.id)
-        
         try:
-            if not self.prefix.value or len(self.prefix.value) > 10: # Check if prefix is empty or too long
-                raise ValueError("Prefix must be between 1 and 10 characters.")
-            if self.prefix.value.isdigit(): # Check if prefix is a number
-                raise ValueError("Prefix cannot be a number.")
-            
-            # Check if embed color is a valid hex
-            hex_int = int(self.embed_color.value.lstrip('#'), 16)
-            if len(self.embed_color.value.lstrip('#')) != 6 or hex_int < 0 or hex_int > 0xFFFFFF:
+            if not PREFIX_RE.fullmatch(self.prefix.value):
+                raise ValueError("Prefix must be between 1 and 10 characters and cannot be a number.")
+            if not HEX_COLOR_RE.fullmatch(self.embed_color.value):
                 raise ValueError("Embed color must be a valid hex color (e.g., #0000FF).")
         except ValueError as e:
             await interaction.response.send_message(f"Invalid input: {e}", ephemeral=True)
             return
         
-        await update_server_config(self.ctx.guild.id, {"prefix": self.prefix.value, "embed_color": self.embed_color.value})
-        await interaction.response.send_message("General settings updated!", ephemeral=True)
-        
-        embed = await self.parent_view.update_embed("general")
-        if self.parent_view.message:
-            await self.parent_view.message.edit(embed=embed)
+        # The stored config the update was merged into is the log's "before", even if it changed while the modal was open.
+        old_config, _ = await modify_server_config(self.guild.id, lambda _: {"prefix": self.prefix.value, "embed_color": self.embed_color.value})
+        # Acknowledge the submit by updating the menu message it came from, in a single response.
+        embed = await build_config_embed(self.guild, interaction.user, "general")
+        await interaction.response.edit_message(embed=embed)
 
-        if  not old_config["config_log"]:
+        if not (log_channel_id := old_config.get("config_log")):
             return
         for setting, old_value in old_config.items():
             if setting in ("prefix", "embed_color") and old_value != getattr(self, setting).value:
                 await post_config_log(
-                    self.ctx.bot, self.ctx.guild.id, old_config["config_log"],
+                    self.bot, self.guild.id, log_channel_id,
                     interaction.user, setting, old_value, getattr(self, setting).value # type: ignore
                 )
 
 
 class CurrencySettingsModal(discord.ui.Modal, title="Edit Currency Settings"):
-    def __init__(self, ctx: commands.Context, parent_view: ConfigMainMenuView, config: ServerConfig):
+    def __init__(self, bot: commands.Bot, guild: discord.Guild, config: ServerConfig):
         super().__init__()
-        self.ctx = ctx
-        self.parent_view = parent_view
+        self.bot = bot
+        self.guild = guild
         eco = config.get('economy', {})
         
         self.currency_name = discord.ui.TextInput(label="Currency Name", default=eco.get('currency_name', 'pounds'))
@@ -434,18 +480,10 @@ class CurrencySettingsModal(discord.ui.Modal, title="Edit Currency Settings"):
         self.add_item(self.starting_balance)
 
     async def on_submit(self, interaction: discord.Interaction):
-        assert self.ctx.guild is not None, "This command can only be used in a guild."
-
-        old_config = await get_server_config(self.ctx.guild.id)
-        
-        try: # Validate and convert starting balance to an integer.
-            if not (self.starting_balance.value and self.starting_balance.value.isdigit()):
-                raise ValueError("Please enter a number.")
-            starting_balance = int(self.starting_balance.value)
-            if starting_balance < 0:
-                raise ValueError("Starting balance must be non-negative.")
+        try:
+            economy_settings = parse_settings("currency", self)
         except ValueError as e:
-            await interaction.response.send_message(f"Invalid starting balance: {e}", ephemeral=True)
+            await interaction.response.send_message(f"Invalid input: {e}", ephemeral=True)
             return
         
         if not self.currency_symbol.value or len(self.currency_symbol.value) > 5: # Check if currency symbol is empty or too long
@@ -456,33 +494,26 @@ class CurrencySettingsModal(discord.ui.Modal, title="Edit Currency Settings"):
             await interaction.response.send_message("Invalid currency name: Currency name must be between 1 and 20 characters.", ephemeral=True)
             return
 
-        economy_settings = {
-            "currency_name": self.currency_name.value,
-            "currency_symbol": self.currency_symbol.value,
-            "starting_balance": starting_balance
-        }
-        await update_server_config(self.ctx.guild.id, {"economy": economy_settings})
-        await interaction.response.send_message("Currency settings updated!", ephemeral=True)
-
-        embed = await self.parent_view.update_embed("currency")
-        if self.parent_view.message:
-            await self.parent_view.message.edit(embed=embed)
+        economy_settings.update(currency_name=self.currency_name.value, currency_symbol=self.currency_symbol.value)
+        old_config, _ = await modify_server_config(self.guild.id, lambda _: {"economy": economy_settings})
+        embed = await build_config_embed(self.guild, interaction.user, "currency")
+        await interaction.response.edit_message(embed=embed)
 
-        if  not old_config["config_log"]:
+        if not (log_channel_id := old_config.get("config_log")):
             return
         for setting, old_value in old_config.get('economy', {}).items():
             if setting in ("currency_name", "currency_symbol", "starting_balance") and old_value != economy_settings[setting]:
                 await post_config_log(
-                    self.ctx.bot, self.ctx.guild.id, old_config["config_log"],
+                    self.bot, self.guild.id, log_channel_id,
                     interaction.user, setting, old_value, economy_settings[setting] # type: ignore
                 )
 
 
 class WorkSettingsModal(discord.ui.Modal, title="Edit Work Settings"):
-    def __init__(self, ctx: commands.Context, parent_view: ConfigMainMenuView, config: ServerConfig):
+    def __init__(self, bot: commands.Bot, guild: discord.Guild, config: ServerConfig):
         super().__init__()
-        self.ctx = ctx
-        self.parent_view = parent_view
+        self.bot = bot
+        self.guild = guild
         eco = config.get('economy', {})
 
         self.work_cooldown_hours = discord.ui.TextInput(label="Work Cooldown (hours)", default=str(eco.get('work_cooldown_hours', 1)))
@@ -493,62 +524,30 @@ class WorkSettingsModal(discord.ui.Modal, title="Edit Work Settings"):
         self.add_item(self.work_max_amount)
         
     async def on_submit(self, interaction: discord.Interaction):
-        assert self.ctx.guild is not None, "This command can only be used in a guild."
-
-        old_config = await get_server_config(self.ctx.guild.id)
-
-        try: # Validate and convert work cooldown to an integer.
-            if not (self.work_cooldown_hours.value and self.work_cooldown_hours.value.isdigit()):
-                raise ValueError("Cooldown hours must be a valid number.")
-            work_cooldown_hours = int(self.work_cooldown_hours.value)
-            if work_cooldown_hours < 0:
-                raise ValueError("Cooldown hours must be non-negative.")
-        except ValueError as e:
-            await interaction.response.send_message(f"Invalid cooldown hours: {e}", ephemeral=True)
-            return
-
-        try: # Validate and convert work amount range to an integer.
-
-            if ((not (self.work_min_amount.value and self.work_max_amount.value)) and 
-                (not (self.work_min_amount.value.isdigit() and self.work_max_amount.value.isdigit()))):
-                raise ValueError("Min and max amounts must be valid numbers.")
-            
-            work_min_amount = int(self.work_min_amount.value)
-            work_max_amount = int(self.work_max_amount.value)
-            if work_min_amount < 0 or work_max_amount < 0:
-                raise ValueError("Min and max amounts must be non-negative.")
-            if work_min_amount > work_max_amount:
-                raise ValueError("Min amount cannot be greater than max amount.")
+        try:
+            economy_settings = parse_settings("work", self)
         except ValueError as e:
-            await interaction.response.send_message(f"Invalid work amount: {e}", ephemeral=True)
+            await interaction.response.send_message(f"Invalid input: {e}", ephemeral=True)
             return
 
-        economy_settings = {
-            "work_cooldown_hours": work_cooldown_hours,
-            "work_min_amount": work_min_amount,
-            "work_max_amount": work_max_amount
-        }
-        await update_server_config(self.ctx.guild.id, {"economy": economy_settings})
-        await interaction.response.send_message("Work settings updated!", ephemeral=True)
-        
-        embed = await self.parent_view.update_embed("work")
-        if self.parent_view.message:
-            await self.parent_view.message.edit(embed=embed)
+        old_config, _ = await modify_server_config(self.guild.id, lambda _: {"economy": economy_settings})
+        embed = await build_config_embed(self.guild, interaction.user, "work")
+        await interaction.response.edit_message(embed=embed)
 
-        if  not old_config["config_log"]:
+        if not (log_channel_id := old_config.get("config_log")):
             return
         for setting, old_value in old_config.get('economy', {}).items():
             if setting in ("work_cooldown_hours", "work_min_amount", "work_max_amount") and old_value != economy_settings[setting]:
                 await post_config_log(
-                    self.ctx.bot, self.ctx.guild.id, old_config["config_log"],
+                    self.bot, self.guild.id, log_channel_id,
                     interaction.user, setting, old_value, economy_settings[setting] # type: ignore
                 )
 
 class StealSettingsModal(discord.ui.Modal, title="Edit Steal Settings"):
-    def __init__(self, ctx: commands.Context, parent_view: ConfigMainMenuView, config: ServerConfig):
+    def __init__(self, bot: commands.Bot, guild: discord.Guild, config: ServerConfig):
         super().__init__()
-        self.ctx = ctx
-        self.parent_view = parent_view
+        self.bot = bot
+        self.guild = guild
         eco = config.get('economy', {})
 
         self.steal_cooldown_hours = discord.ui.TextInput(label="Steal Cooldown (hours)", default=str(eco.get('steal_cooldown_hours', 6)))
@@ -561,150 +560,93 @@ class StealSettingsModal(discord.ui.Modal, title="Edit Steal Settings"):
         self.add_item(self.steal_max_percentage)
 
     async def on_submit(self, interaction: discord.Interaction):
-        assert self.ctx.guild is not None, "This command can only be used in a guild."
-
-        old_config = await get_server_config(self.ctx.guild.id)
-
-        try: # Validate and convert steal cooldown to an integer.
-            if not (self.steal_cooldown_hours.value and self.steal_cooldown_hours.value.isdigit()):
-                raise ValueError("Cooldown hours must be a valid number.")
-            steal_cooldown_hours = int(self.steal_cooldown_hours.value)
-            if steal_cooldown_hours < 0:
-                raise ValueError("Cooldown hours must be non-negative.")
-        except ValueError as e:
-            await interaction.response.send_message(f"Invalid cooldown hours: {e}", ephemeral=True)
-            return
-        
-        try: # Validate and convert steal chance to a float.
-            if not (self.steal_chance.value and self.steal_chance.value.replace('.', '', 1).isdigit()):
-                raise ValueError("Steal chance must be a valid number between 0.0 and 1.0.")
-            steal_chance = float(self.steal_chance.value)
-            if not (0 <= steal_chance <= 1):
-                raise ValueError("Steal chance must be between 0.0 and 1.0.")
-        except ValueError as e:
-            await interaction.response.send_message(f"Invalid steal chance: {e}", ephemeral=True)
-            return
-        
-        try: # Validate and convert steal penalty to an integer.
-            if not (self.steal_penalty.value and self.steal_penalty.value.isdigit()):
-                raise ValueError("Steal penalty must be a valid number.")
-            steal_penalty = int(self.steal_penalty.value)
-            if steal_penalty < 0:
-                raise ValueError("Steal penalty must be non-negative.")
-        except ValueError as e:
-            await interaction.response.send_message(f"Invalid steal penalty: {e}", ephemeral=True)
-            return
-        
-        try: # Validate and convert steal max percentage to a float.
-            if not (self.steal_max_percentage.value and self.steal_max_percentage.value.replace('.', '', 1).isdigit()):
-                raise ValueError("Steal max percentage must be a valid number between 0.0 and 1.0.")
-            steal_max_percentage = float(self.steal_max_percentage.value)
-            if not (0 <= steal_max_percentage <= 1):
-                raise ValueError("Steal max percentage must be between 0.0 and 1.0.")
+        try:
+            economy_settings = parse_settings("steal", self)
         except ValueError as e:
-            await interaction.response.send_message(f"Invalid steal max percentage: {e}", ephemeral=True)
+            await interaction.response.send_message(f"Invalid input: {e}", ephemeral=True)
             return
 
-        economy_settings = {
-            "steal_cooldown_hours": steal_cooldown_hours,
-            "steal_chance": steal_chance,
-            "steal_penalty": steal_penalty,
-            "steal_max_percentage": steal_max_percentage
-        }
-        await update_server_config(self.ctx.guild.id, {"economy": economy_settings})
-        await interaction.response.send_message("Steal settings updated!", ephemeral=True)
+        old_config, _ = await modify_server_config(self.guild.id, lambda _: {"economy": economy_settings})
+        embed = await build_config_embed(self.guild, interaction.user, "steal")
+        await interaction.response.edit_message(embed=embed)
 
-        embed = await self.parent_view.update_embed("steal")
-        if self.parent_view.message:
-            await self.parent_view.message.edit(embed=embed)
-
-        if  not old_config["config_log"]:
+        if not (log_channel_id := old_config.get("config_log")):
             return
         for setting, old_value in old_config.get('economy', {}).items():
             if setting in ("steal_cooldown_hours", "steal_chance", "steal_penalty", "steal_max_percentage") and old_value != economy_settings[setting]:
                 await post_config_log(
-                    self.ctx.bot, self.ctx.guild.id, old_config["config_log"],
+                    self.bot, self.guild.id, log_channel_id,
                     interaction.user, setting, old_value, economy_settings[setting] # type: ignore
                 )
 
 
 class MoneyDropSettingsModal(discord.ui.Modal, title="Edit Money Drop Settings"):
-    def __init__(self, ctx: commands.Context, parent_view: ConfigMainMenuView, config: ServerConfig):
+    # (setting, label, default) for each input. The default is pre-rendered and only used
+    # when the setting is missing from the stored config.
+    _FIELDS = tuple((setting, label, f"{MONEY_DROP_FALLBACKS[setting]}") for setting, label in (
+        ("enabled", "Enabled (True/False)"),
+        ("chance", "Chance (0.0 to 1.0)"),
+        ("min_amount", "Min Amount"),
+        ("max_amount", "Max Amount"),
+    ))
+    enabled: discord.ui.TextInput
+    chance: discord.ui.TextInput
+    min_amount: discord.ui.TextInput
+    max_amount: discord.ui.TextInput
+
+    def __init__(self, bot: commands.Bot, guild: discord.Guild, config: ServerConfig):
         super().__init__()
-        self.ctx = ctx
-        self.parent_view = parent_view
+        self.bot = bot
+        self.guild = guild
         drop = config.get('moneydrop', {})
 
-        self.enabled = discord.ui.TextInput(label="Enabled (True/False)", default=str(drop.get('enabled', False)))
-        self.chance = discord.ui.TextInput(label="Chance (0.0 to 1.0)", default=str(drop.get('chance', 0.05)))
-        self.min_amount = discord.ui.TextInput(label="Min Amount", default=str(drop.get('min_amount', 50)))
-        self.max_amount = discord.ui.TextInput(label="Max Amount", default=str(drop.get('max_amount', 150)))
-        self.add_item(self.enabled)
-        self.add_item(self.chance)
-        self.add_item(self.min_amount)
-        self.add_item(self.max_amount)
+        for setting, label, default in self._FIELDS:
+            value = drop.get(setting)
+            text_input = discord.ui.TextInput(label=label, default=default if value is None else f"{value}")
+            setattr(self, setting, text_input)
+            self.add_item(text_input)
         
     async def on_submit(self, interaction: discord.Interaction):
-        assert self.ctx.guild is not None, "This command can only be used in a guild."
-
-        old_config = await get_server_config(self.ctx.guild.id)
-
         try: # Validate enabled value.
-            if self.enabled.value.lower() not in ('true', 'false', "0", "1", "yes", "no", "on", "off"):
+            enabled_value = self.enabled.value.lower()
+            if enabled_value in TRUTHY_VALUES:
+                enabled = True
+            elif enabled_value in FALSY_VALUES:
+                enabled = False
+            else:
                 raise ValueError("Enabled must be 'True' or 'False'.")
-            enabled = self.enabled.value.lower() in ('true', "1", "yes", "on")
         except ValueError as e:
             await interaction.response.send_message(f"Invalid enabled value: {e}", ephemeral=True)
             return
         
-        try: # Validate and convert chance to a float.
-            if not (self.chance.value and self.chance.value.replace('.', '', 1).isdigit()):
-                raise ValueError("Chance must be a valid number between 0.0 and 1.0.")
-            chance = float(self.chance.value)
-            if not (0 <= chance <= 1):
-                raise ValueError("Chance must be between 0.0 and 1.0.")
-        except ValueError as e:
-            await interaction.response.send_message(f"Invalid chance: {e}", ephemeral=True)
-            return
-
-        try: # Validate and convert amount range to an integer.
-
-            if ((not (self.min_amount.value and self.max_amount.value)) and
-                (not (self.min_amount.value.isdigit() and self.max_amount.value.isdigit()))):
-                raise ValueError("Min and max amounts must be valid numbers.")
-
-            min_amount = int(self.min_amount.value)
-            max_amount = int(self.max_amount.value)
-            if min_amount < 0 or max_amount < 0:
-                raise ValueError("Min and max amounts must be non-negative.")
-            if min_amount > max_amount:
-                raise ValueError("Min amount cannot be greater than max amount.")
+        try:
+            moneydrop_settings = {"enabled": enabled, **parse_settings("moneydrop", self)}
         except ValueError as e:
-            await interaction.response.send_message(f"Invalid amount: {e}", ephemeral=True)
+            await interaction.response.send_message(f"Invalid input: {e}", ephemeral=True)
             return
 
-        moneydrop_settings = {
-            "enabled": enabled,
-            "chance": chance,
-            "min_amount": min_amount,
-            "max_amount": max_amount
-        }
-        await update_server_config(self.ctx.guild.id, {"moneydrop": moneydrop_settings})
-        await interaction.response.send_message("Money Drop settings updated!", ephemeral=True)
+        old_config, _ = await modify_server_config(self.guild.id, lambda _: {"moneydrop": moneydrop_settings})
+        embed = await build_config_embed(self.guild, interaction.user, "moneydrop")
+        await interaction.response.edit_message(embed=embed)
 
-        embed = await self.parent_view.update_embed("moneydrop")
-        if self.parent_view.message:
-            await self.parent_view.message.edit(embed=embed)
-
-        if  not old_config["config_log"]:
+        if not (log_channel_id := old_config.get("config_log")):
             return
         for setting, old_value in old_config.get('moneydrop', {}).items():
             if setting in ("enabled", "chance", "min_amount", "max_amount") and old_value != moneydrop_settings[setting]:
                 await post_config_log(
-                    self.ctx.bot, self.ctx.guild.id, old_config["config_log"],
+                    self.bot, self.guild.id, log_channel_id,
                     interaction.user, ("moneydrop_" + setting), old_value, moneydrop_settings[setting] # type: ignore
                 )
 
+# Section name -> the modal that edits it. Only the one being opened is instantiated.
+SECTION_MODALS: Dict[str, Callable[[commands.Bot, discord.Guild, ServerConfig], discord.ui.Modal]] = {
+    "general": GeneralSettingsModal,
+    "currency": CurrencySettingsModal,
+    "work": WorkSettingsModal,
+    "steal": StealSettingsModal,
+    "moneydrop": MoneyDropSettingsModal
+}
+
 async def setup(bot: commands.Bot) -> None:
     """Sets up the ConfigCog and adds it to the bot."""
     await bot.add_cog(ConfigCog(bot))
\ No newline at end of file
@@ -1,6 +1,8 @@
+import asyncio
 import discord
 from discord.ext import commands
 import random
+import secrets
 from datetime import datetime, timedelta, timezone
 from string import ascii_uppercase, digits
 from utils.supabase_client import (
@@ -8,26 +10,36 @@ from utils.supabase_client import (
     update_user_balance,
     update_user_economy,
     get_server_config,
-    get_multiple_user_economy_data,
-    EconomyData
+    get_leaderboard_entries,
+    InsufficientFundsError,
+    LeaderboardEntry,
+    ServerConfig
 )
 from typing import Optional, List, Union, Dict, Any
 from utils.helpers import *
 
 # Number of entries per page in the leaderboard
 LEADERBOARD_ENTRIES_PER_PAGE = 10
+# Maximum number of concurrent Discord user fetches when resolving leaderboard names
+LEADERBOARD_FETCH_CONCURRENCY = 5
+# Characters used in TikTok link verification codes
+LINK_CODE_ALPHABET = ascii_uppercase + digits
 
 class LeaderboardView(discord.ui.View):
     """
     A Discord UI View for the paginated leaderboard, containing navigation buttons.
     """
-    def __init__(self, ctx: commands.Context, all_entries: List[EconomyData], total_pages: int) -> None:
+    def __init__(self, ctx: commands.Context, config: ServerConfig, all_entries: List[LeaderboardEntry], total_pages: int) -> None:
         super().__init__(timeout=120.0)  # Timeout after 2 minutes of inactivity
         self.ctx = ctx
+        self.config = config # Loaded once by the command and reused by every page render.
         self.all_entries = all_entries
+        self.rank_by_user_id: Dict[int, int] = {int(entry['user_id']): i for i, entry in enumerate(all_entries)} # For the Self button.
         self.total_pages = total_pages
         self.current_page = 0
         self.message: Optional[discord.Message] = None
+        self.user_names: Dict[int, str] = {} # Display names resolved so far, reused across page turns.
+        self.footer_icon_url = ctx.author.display_avatar.url if ctx.author.avatar else None # Same on every page.
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """
@@ -38,6 +50,34 @@ class LeaderboardView(discord.ui.View):
             return False
         return True
 
+    async def _resolve_user_names(self, user_ids: List[int]) -> None:
+        """
+        Resolves the display names of `user_ids` into `self.user_names`.
+        Users in the bot's cache are resolved directly, the rest are fetched from Discord concurrently.
+        """
+        to_fetch: List[int] = []
+        for user_id in user_ids:
+            if user_id in self.user_names:
+                continue
+            if user := self.ctx.bot.get_user(user_id):
+                self.user_names[user_id] = user.display_name
+            else:
+                to_fetch.append(user_id)
+
+        if not to_fetch:
+            return
+
+        semaphore = asyncio.Semaphore(LEADERBOARD_FETCH_CONCURRENCY)
+        async def fetch_name(user_id: int) -> str:
+            async with semaphore:
+                try:
+                    return (await self.ctx.bot.fetch_user(user_id)).display_name
+                except discord.NotFound:
+                    return "Unknown User"
+
+        names = await asyncio.gather(*(fetch_name(user_id) for user_id in to_fetch))
+        self.user_names.update(zip(to_fetch, names))
+
     async def _update_leaderboard_embed(self) -> discord.Embed:
         """
         Helper to create and return the leaderboard embed for the current page.
@@ -45,7 +85,7 @@ class LeaderboardView(discord.ui.View):
         assert self.ctx.guild is not None
 
         guild_id = self.ctx.guild.id 
-        color = await get_embed_color(guild_id)
+        color = get_embed_color_from_config(self.config)
         embed = discord.Embed(title=f"Leaderboard", color=color)
 
         start_index = self.current_page * LEADERBOARD_ENTRIES_PER_PAGE
@@ -54,21 +94,17 @@ class LeaderboardView(discord.ui.View):
         # Determine the users to display on the current page
         current_page_entries = self.all_entries[start_index:end_index]
 
+        # Resolve every name on the page up front, instead of one fetch at a time in the loop below
+        page_user_ids = [int(entry['user_id']) for entry in current_page_entries]
+        await self._resolve_user_names(page_user_ids)
+
         # Add fields for each user on the current page
-        for i, entry in enumerate(current_page_entries):
+        for i, (entry, user_id) in enumerate(zip(current_page_entries, page_user_ids)):
             global_rank = start_index + i + 1 # Calculate rank
-            user_id = entry['user_id']
             balance_val = entry['balance']
+            user_name = self.user_names[user_id]
 
-            try:
-                user: discord.User = self.ctx.bot.get_user(user_id) or await self.ctx.bot.fetch_user(user_id)
-                user_name = user.display_name
-                # user_avatar_url = user.display_avatar.url # Removed: Not used for individual display
-            except discord.NotFound:
-                user_name = "Unknown User"
-                # user_avatar_url = "" # Removed: Not used for individual display
-
-            formatted_bal = await format_currency(guild_id, balance_val)
+            formatted_bal = format_currency_from_config(self.config, balance_val)
             
             embed.add_field(
                 name=f"{global_rank}. {user_name}",
@@ -80,7 +116,7 @@ class LeaderboardView(discord.ui.View):
 
 
         embed.set_footer(text=f"Requested by {self.ctx.author.display_name} | Page {self.current_page + 1}/{self.total_pages}",
-                         icon_url=self.ctx.author.display_avatar.url if self.ctx.author.avatar else None
+                         icon_url=self.footer_icon_url
         )
         return embed
 
@@ -99,16 +135,15 @@ class LeaderboardView(discord.ui.View):
     async def self_button(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
         user_id = self.ctx.author.id
         # Find the user's rank
-        for i, entry in enumerate(self.all_entries):
-            if entry['user_id'] == user_id:
-                target_page = i // LEADERBOARD_ENTRIES_PER_PAGE
-                if self.current_page != target_page:
-                    self.current_page = target_page
-                    await interaction.response.edit_message(embed=await self._update_leaderboard_embed(), view=self)
-                else:
-                    await interaction.response.send_message("You are already on your page!", ephemeral=True)
-                return
-        await interaction.response.send_message("You are not currently on the leaderboard. Participate in the economy!", ephemeral=True)
+        if (i := self.rank_by_user_id.get(user_id)) is None:
+            await interaction.response.send_message("You are not currently on the leaderboard. Participate in the economy!", ephemeral=True)
+            return
+        target_page = i // LEADERBOARD_ENTRIES_PER_PAGE
+        if self.current_page != target_page:
+            self.current_page = target_page
+            await interaction.response.edit_message(embed=await self._update_leaderboard_embed(), view=self)
+        else:
+            await interaction.response.send_message("You are already on your page!", ephemeral=True)
 
     @discord.ui.button(label="Right ➡️", style=discord.ButtonStyle.blurple)
     async def right_button(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
@@ -127,7 +162,7 @@ class EconomyCog(commands.Cog, name="Economy"):
         self.bot = bot
 
     @commands.command(name='balance', aliases=['bal'])
-    @guild_only()
+    @commands.guild_only()
     @in_allowed_channels()
     async def balance(self, ctx: commands.Context, member_str: Optional[Union[discord.Member, str]] = None) -> None:
         """
@@ -155,7 +190,7 @@ class EconomyCog(commands.Cog, name="Economy"):
         await send_embed(ctx, f"{member.mention}'s balance is {formatted_bal}.", image_url=member.display_avatar.url)
 
     @commands.command(name='leaderboard', aliases=['lb'])
-    @guild_only()
+    @commands.guild_only()
     @in_allowed_channels()
     async def leaderboard(self, ctx: commands.Context) -> None:
         """
@@ -163,8 +198,10 @@ class EconomyCog(commands.Cog, name="Economy"):
         """
         assert ctx.guild is not None
 
-        all_entries = await get_multiple_user_economy_data(ctx.guild.id)
-        all_entries.sort(key=lambda x: x['balance'], reverse=True)
+        config, all_entries = await asyncio.gather(
+            get_server_config(ctx.guild.id),
+            get_leaderboard_entries(ctx.guild.id) # Already sorted by balance, highest first.
+        )
 
         if not all_entries:
             await send_embed(ctx, "No one has participated in the economy yet.")
@@ -173,14 +210,15 @@ class EconomyCog(commands.Cog, name="Economy"):
         total_pages = (len(all_entries) + LEADERBOARD_ENTRIES_PER_PAGE - 1) // LEADERBOARD_ENTRIES_PER_PAGE
         
         # Initialize the view and send the first page
-        view = LeaderboardView(ctx, all_entries, total_pages)
+        view = LeaderboardView(ctx, config, all_entries, total_pages)
         initial_embed = await view._update_leaderboard_embed()
         view.message = await ctx.send(embed=initial_embed, view=view)
 
 
     @commands.command(name='work', aliases=['w'])
-    @guild_only()
+    @commands.guild_only()
     @in_allowed_channels()
+    @commands.max_concurrency(1, per=commands.BucketType.member, wait=True) # A repeat waits, then sees the new cooldown.
     async def work(self, ctx: commands.Context) -> None:
         """
         Allows a user to 'work' to earn a random amount of money.
@@ -189,40 +227,39 @@ class EconomyCog(commands.Cog, name="Economy"):
 
         guild_id = ctx.guild.id
         user_id = ctx.author.id
-        # Get server and economy specific configurations.
-        config = await get_server_config(guild_id)
+        # Get server config and the user's economy data (to check their last work time) concurrently.
+        config, user_data = await asyncio.gather(get_server_config(guild_id), get_user_economy_data(guild_id, user_id))
         eco_config = config['economy']
 
-        # Fetch user's economy data to check their last work time.
-        user_data = await get_user_economy_data(guild_id, user_id)
+        now = datetime.now(timezone.utc) # Used for both the cooldown check and the new 'last_work' time.
         last_work_str: Optional[str] = user_data.get('last_work')
         if last_work_str:
             # Convert the stored ISO format string timestamp to a timezone-aware datetime object.
-            last_work_time = datetime.fromisoformat(last_work_str).astimezone(timezone.utc)
+            last_work_time = parse_utc_iso(last_work_str)
             
             # Check if the cooldown period has passed.
-            cooldown = timedelta(hours=eco_config['work_cooldown_hours'])
-            if datetime.now(timezone.utc) < last_work_time + cooldown:
-                remaining = (last_work_time + cooldown) - datetime.now(timezone.utc)
+            ready_at = last_work_time + timedelta(hours=eco_config['work_cooldown_hours'])
+            if now < ready_at:
+                remaining = ready_at - now
                 # Inform the user about the remaining cooldown.
-                await send_embed(ctx, f"You're tired. You can work again in **{str(timedelta(seconds=int(remaining.total_seconds())))}**.")
+                await send_embed(ctx, f"You're tired. You can work again in **{format_cooldown(remaining)}**.")
                 return
 
         # Calculate random earnings within the configured range.
         earnings = random.randint(eco_config['work_min_amount'], eco_config['work_max_amount'])
-        await update_user_balance(guild_id, user_id, earnings, "work", "USER")
-        await update_user_economy(guild_id, user_id, {'last_work': datetime.now(timezone.utc).isoformat()})
+        await update_user_balance(guild_id, user_id, earnings, "work", "USER", extra_data={'last_work': now.isoformat()})
 
         # Inform the user about their earnings.
-        formatted_earnings = await format_currency(guild_id, earnings)
+        formatted_earnings = format_currency_from_config(config, earnings)
         await send_embed(ctx, f"You worked hard and earned {formatted_earnings}!")
 
         if log_channel_id := eco_config.get('log_channel'):
-            await post_money_log(self.bot, guild_id, log_channel_id, "work", earnings, "USER", user_id)
+            run_in_background(post_money_log(self.bot, guild_id, log_channel_id, "work", earnings, "USER", user_id))
 
     @commands.command(name='steal', aliases=['rob', 's'])
-    @guild_only()
+    @commands.guild_only()
     @in_allowed_channels()
+    @commands.max_concurrency(1, per=commands.BucketType.member, wait=True) # A repeat waits, then sees the new cooldown.
     async def steal(self, ctx: commands.Context, member: Optional[Union[discord.Member, str]] = None) -> None:
         """
         Attempt to steal money from another member.
@@ -242,19 +279,6 @@ class EconomyCog(commands.Cog, name="Economy"):
 
         guild_id = ctx.guild.id
         user_id = ctx.author.id
-        config = await get_server_config(guild_id)
-        eco_config = config['economy']
-
-        # Check for steal cooldown.
-        user_data = await get_user_economy_data(guild_id, user_id)
-        last_steal_str: Optional[str] = user_data.get('last_steal')
-        if last_steal_str:
-            last_steal_time = datetime.fromisoformat(last_steal_str).astimezone(timezone.utc)
-            cooldown = timedelta(hours=eco_config.get('steal_cooldown_hours', 6))
-            if datetime.now(timezone.utc) < last_steal_time + cooldown:
-                remaining = (last_steal_time + cooldown) - datetime.now(timezone.utc)
-                await send_embed(ctx, f"You need to lay low. You can steal again in **{str(timedelta(seconds=int(remaining.total_seconds())))}**.")
-                return
 
         # Prevent stealing from self.
         if member.id == user_id:
@@ -265,44 +289,64 @@ class EconomyCog(commands.Cog, name="Economy"):
             await send_embed(ctx, "You can't steal from bots.")
             return
 
-        # Update the 'last_steal' timestamp immediately, regardless of success, to start cooldown.
-        await update_user_economy(guild_id, user_id, {'last_steal': datetime.now(timezone.utc).isoformat()})
+        config, user_data = await asyncio.gather(get_server_config(guild_id), get_user_economy_data(guild_id, user_id))
+        eco_config = config['economy']
+
+        # Check for steal cooldown.
+        now = datetime.now(timezone.utc) # Used for both the cooldown check and the new 'last_steal' time.
+        last_steal_str: Optional[str] = user_data.get('last_steal')
+        if last_steal_str:
+            last_steal_time = parse_utc_iso(last_steal_str)
+            ready_at = last_steal_time + timedelta(hours=eco_config.get('steal_cooldown_hours', 6))
+            if now < ready_at:
+                remaining = ready_at - now
+                await send_embed(ctx, f"You need to lay low. You can steal again in **{format_cooldown(remaining)}**.")
+                return
+
+        # Every outcome starts the cooldown. It is written together with the balance change where there is one.
+        cooldown_data = {'last_steal': now.isoformat()}
 
         # Determine if the steal attempt is successful based on configured chance.
         if random.random() < eco_config['steal_chance']:
-            # Steal successful logic.
+            # Steal successful logic. The target is only loaded here, so rejected and failed steals don't fetch (or create) their row.
             target_data = await get_user_economy_data(guild_id, member.id)
             target_balance = target_data.get('balance', 0)
             if target_balance < 1:
                 # Cannot steal if target has no money.
+                await update_user_economy(guild_id, user_id, cooldown_data)
                 await send_embed(ctx, f"**{member.mention}** has no money to steal!", image_url=member.display_avatar.url)
 
                 if log_channel_id := eco_config.get('log_channel'):
-                    await post_money_log(self.bot, guild_id, log_channel_id, "steal_denied", 0, "USER", user_id, member.id)
+                    run_in_background(post_money_log(self.bot, guild_id, log_channel_id, "steal_denied", 0, "USER", user_id, member.id))
                 return
 
             # Calculate amount stolen: random between 1 and max percentage of target's balance.
-            amount_stolen = random.randint(1, max(1, int(target_balance * eco_config['steal_max_percentage'])))
-            # Update balances and log transactions for both stealer and victim.
-            await update_user_balance(guild_id, user_id, amount_stolen, "steal_success", "USER", member.id)
-            await update_user_balance(guild_id, member.id, -amount_stolen, "stolen_from", "USER", user_id)
+            max_stolen = max(1, int(target_balance * eco_config['steal_max_percentage']))
+            amount_stolen = 1 + int(random.random() * max_stolen)
+            # Update balances and log transactions for both stealer and victim, concurrently as they're separate rows.
+            await asyncio.gather(
+                update_user_balance(guild_id, user_id, amount_stolen, "steal_success", "USER", member.id, cooldown_data),
+                update_user_balance(guild_id, member.id, -amount_stolen, "stolen_from", "USER", user_id)
+            )
 
-            formatted_stolen = await format_currency(guild_id, amount_stolen)
+            formatted_stolen = format_currency_from_config(config, amount_stolen)
             await send_embed(ctx, f"Success! You stole {formatted_stolen} from **{member.mention}**.", image_url=member.display_avatar.url)
             if log_channel_id := eco_config.get('log_channel'):
-                await post_money_log(self.bot, guild_id, log_channel_id, "steal_success", amount_stolen, "USER", user_id, member.id)
-                await post_money_log(self.bot, guild_id, log_channel_id, "stolen_from", -amount_stolen, "USER", member.id, user_id)
+                run_in_background(asyncio.gather(
+                    post_money_log(self.bot, guild_id, log_channel_id, "steal_success", amount_stolen, "USER", user_id, member.id),
+                    post_money_log(self.bot, guild_id, log_channel_id, "stolen_from", -amount_stolen, "USER", member.id, user_id)
+                ))
         else:
             # Steal failed logic: apply penalty to the stealer.
             penalty = eco_config['steal_penalty']
-            await update_user_balance(guild_id, user_id, -penalty, "steal_fail", "USER", member.id)
-            formatted_penalty = await format_currency(guild_id, penalty)
+            await update_user_balance(guild_id, user_id, -penalty, "steal_fail", "USER", member.id, cooldown_data)
+            formatted_penalty = format_currency_from_config(config, penalty)
             await send_embed(ctx, f"You were caught! You paid a penalty of {formatted_penalty}.")
             if log_channel_id := eco_config.get('log_channel'):
-                await post_money_log(self.bot, guild_id, log_channel_id, "steal_fail", -penalty, "USER", user_id, member.id)
+                run_in_background(post_money_log(self.bot, guild_id, log_channel_id, "steal_fail", -penalty, "USER", user_id, member.id))
 
     @commands.command(name='give', aliases=['donate', 'g'])
-    @guild_only()
+    @commands.guild_only()
     @in_allowed_channels()
     async def give(self, ctx: commands.Context, member: Optional[Union[discord.Member, str]] = None, *, amount: Optional[str] = None) -> None:
         """
@@ -334,7 +378,8 @@ class EconomyCog(commands.Cog, name="Economy"):
             await send_embed(ctx, "You can't give from bots.")
             return
 
-        user_data = await get_user_economy_data(guild_id, user_id)
+        config, user_data = await asyncio.gather(get_server_config(guild_id), get_user_economy_data(guild_id, user_id))
+        eco_config = config['economy']
         user_balance = user_data.get('balance', 0)
 
         # Determine Amount 
@@ -348,26 +393,28 @@ class EconomyCog(commands.Cog, name="Economy"):
         if amount_given <= 0:
             await send_embed(ctx, "Bet must be a positive amount.")
             return
-        if amount_given > user_balance:
-            formatted_balance = await format_currency(ctx.guild.id, user_balance)
+
+        # The sender is debited first, with the balance check done under their economy lock, so concurrent gives can't overdraw them.
+        try:
+            await update_user_balance(guild_id, user_id, -amount_given, "give_success", "USER", member.id, require_funds=True)
+        except InsufficientFundsError as e:
+            formatted_balance = format_currency_from_config(config, e.balance)
             await send_embed(ctx, f"You don't have enough to give that much. Your balance is {formatted_balance}.")
             return
-        
-        await update_user_balance(guild_id, user_id, -amount_given, "give_success", "USER", member.id)
         await update_user_balance(guild_id, member.id, amount_given, "given_to", "USER", user_id)
 
-        formatted_given = await format_currency(guild_id, amount_given)
+        formatted_given = format_currency_from_config(config, amount_given)
         await send_embed(ctx, f"Success! You gave {formatted_given} to **{member.mention}**.", image_url=member.display_avatar.url)
 
-        config = await get_server_config(guild_id)
-        eco_config = config['economy']
         if log_channel_id := eco_config.get('log_channel'):
-            await post_money_log(self.bot, guild_id, log_channel_id, "give_success", -amount_given, "USER", user_id, member.id)
-            await post_money_log(self.bot, guild_id, log_channel_id, "given_to", amount_given, "USER", member.id, user_id)
+            run_in_background(asyncio.gather(
+                post_money_log(self.bot, guild_id, log_channel_id, "give_success", -amount_given, "USER", user_id, member.id),
+                post_money_log(self.bot, guild_id, log_channel_id, "given_to", amount_given, "USER", member.id, user_id)
+            ))
     
 
     @commands.command(name='link', aliases=['l'])
-    @guild_only()
+    @commands.guild_only()
     @in_allowed_channels()
     async def link(self, ctx: commands.Context, username: str) -> None:
         """
@@ -376,16 +423,15 @@ class EconomyCog(commands.Cog, name="Economy"):
         - `username`: The TikTok username to link.
         """
         assert ctx.guild is not None
-        user_data = await get_user_economy_data(ctx.guild.id, ctx.author.id)
-        prefix = (await get_server_config(ctx.guild.id))["prefix"]
-
+        user_data, config = await asyncio.gather(get_user_economy_data(ctx.guild.id, ctx.author.id), get_server_config(ctx.guild.id))
+        prefix = config["prefix"]
 
         already_linked = user_data.get('tiktok', {}).get('id')
         if already_linked:
             await send_embed(ctx, "You already have a TikTok account linked. Contact the Bot Owner to unlink it.")
             return
 
-        code = "BowBot-" + ''.join(random.choices(ascii_uppercase + digits, k=8))
+        code = "BowBot-" + ''.join(secrets.choice(LINK_CODE_ALPHABET) for _ in range(8)) # Unpredictable, as it proves account ownership.
         username = username.lstrip("@")
 
         await update_user_economy(ctx.guild.id, ctx.author.id, {
@@ -405,7 +451,7 @@ class EconomyCog(commands.Cog, name="Economy"):
                 f"```\n{code}\n```\n\n"
                 f"Once you've updated your bio, go to the [server]({ctx.message.jump_url}) and run the `{prefix}verify` command."
             ),
-            color=await get_embed_color(ctx.guild.id)
+            color=get_embed_color_from_config(config)
         )
         embed.set_thumbnail(url=ctx.guild.icon.url if ctx.guild.icon else ctx.bot.user.display_avatar.url)
         embed.set_footer(text="This code expires in 1 hour.")
@@ -413,7 +459,7 @@ class EconomyCog(commands.Cog, name="Economy"):
         await send_embed(ctx,f"{ctx.author.mention}, I've sent you a [DM]({dm_message.jump_url}) with instructions on how to verify your account.")
 
     @commands.command(name='verify', aliases=['v'])
-    @guild_only()
+    @commands.guild_only()
     @in_allowed_channels()
     async def verify(self, ctx: commands.Context) -> None:
         assert ctx.guild is not None
@@ -426,7 +472,7 @@ class EconomyCog(commands.Cog, name="Economy"):
             return
         
         code_expires = tiktok_data.get('code_expires')
-        if code_expires is not None and datetime.fromisoformat(code_expires).astimezone(timezone.utc) < datetime.now(timezone.utc):
+        if code_expires is not None and parse_utc_iso(code_expires) < datetime.now(timezone.utc):
             await send_embed(ctx, f"Your TikTok verification code has expired. Please link your account again using `{prefix}link <username>`.")
             return
 
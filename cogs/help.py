@@ -1,13 +1,57 @@
 import discord
 from discord.ext import commands
 from utils.helpers import *
-from typing import Optional, cast, List, Dict
+from typing import Optional, cast, List, Dict, Tuple
+from collections import defaultdict
 
 class HelpCog(commands.Cog, name="Help"):
     """Provides a custom help command for the bot."""
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        # Top-level command names grouped by cog, both sorted. Built on first use, see `get_command_index`.
+        self.command_index: List[Tuple[str, List[str]]] = []
+        self.command_index_key: Optional[Tuple[commands.Cog, ...]] = None
+        # Command signatures keyed by (qualified name, prefix), see `get_command_signature`.
+        self.signature_cache: Dict[Tuple[str, str], str] = {}
+        self.signature_cache_key: Optional[Tuple[commands.Cog, ...]] = None
+
+    def get_cogs_key(self) -> Tuple[commands.Cog, ...]:
+        """
+        Gets a key that changes whenever a cog is added, removed or reloaded, to invalidate the caches above.
+        The cog objects themselves are the key, compared by identity. Unlike their ids, which Python reuses once
+        an unloaded cog is freed, a reloaded cog can never match the instance it replaced while the key holds it.
+        """
+        return tuple(self.bot.cogs.values())
+
+    def get_command_index(self) -> List[Tuple[str, List[str]]]:
+        """
+        Gets the top-level command names grouped by cog, for the general help message.
+        The index is only rebuilt when the loaded cogs change, instead of walking every command per `help`.
+        Returns:
+        - A list of (cog name, command names) pairs, sorted by cog name and then command name.
+        """
+        cogs_key = self.get_cogs_key()
+        if cogs_key == self.command_index_key:
+            return self.command_index
+
+        # Group commands by their top-level cog or categorize them as "Uncategorized".
+        categorized_commands: Dict[str, List[commands.Command]] = defaultdict(list)
+        for command in self.bot.walk_commands():
+            if command.hidden or command.cog_name == "Events":
+                continue
+            if command.parent is not None:
+                continue  # only show top-level in main view
+
+            cog_name = command.cog_name or "Uncategorized"
+            categorized_commands[cog_name].append(command)
+
+        self.command_index = [
+            (cog_name, sorted(command.name for command in categorized_commands[cog_name]))
+            for cog_name in sorted(categorized_commands.keys())
+        ]
+        self.command_index_key = cogs_key
+        return self.command_index
 
     def get_command_signature(self, command: commands.Command, prefix: str) -> str:
         """
@@ -18,21 +62,31 @@ class HelpCog(commands.Cog, name="Help"):
         Returns:
         - A string representing the full command signature, e.g., `!config general prefix <new_prefix>`.
         """
+        # Signatures only change when cogs are reloaded, so they're cached per command and prefix.
+        if (cogs_key := self.get_cogs_key()) != self.signature_cache_key:
+            self.signature_cache.clear()
+            self.signature_cache_key = cogs_key
+        key = (command.qualified_name, prefix)
+        if key in self.signature_cache:
+            return self.signature_cache[key]
+
         parent = command.parent
         if parent is None:
-            return f"`{prefix}{command.name} {command.signature}`"
-
-        parent_names: List[str] = []
-        current_parent: Optional[commands.Group] = parent #type: ignore
-        # Traverse up the command hierarchy to get all parent names.
-        while current_parent is not None:
-            parent_as_cmd = cast(commands.Command, current_parent)
-            parent_names.insert(0, parent_as_cmd.name) # Insert at the beginning to maintain order.
-            current_parent = current_parent.parent #type: ignore
+            signature = f"`{prefix}{command.name} {command.signature}`"
+        else:
+            parent_names: List[str] = []
+            current_parent: Optional[commands.Group] = parent #type: ignore
+            # Traverse up the command hierarchy to get all parent names.
+            while current_parent is not None:
+                parent_as_cmd = cast(commands.Command, current_parent)
+                parent_names.append(parent_as_cmd.name)
+                current_parent = current_parent.parent #type: ignore
 
+            full_name = " ".join(reversed(parent_names)) # Collected innermost first, so reverse to maintain order.
+            signature = f"`{prefix}{full_name} {command.name} {command.signature}`"
 
-        full_name = " ".join(parent_names)
-        return f"`{prefix}{full_name} {command.name} {command.signature}`"
+        self.signature_cache[key] = signature
+        return signature
 
     @commands.command(name="help")
     async def help_command(self, ctx: commands.Context, *, name: Optional[str] = None) -> None:
@@ -42,6 +96,7 @@ class HelpCog(commands.Cog, name="Help"):
         - `name`: Optional. The name of the command or cog to get help for.
                                  If None, lists all commands.
         """
+        is_owner = is_bot_owner(ctx) # Decides whether the Owner category is shown.
         if ctx.guild:
             # Get the bot's prefix for the current guild.
             prefix_list = await self.bot.get_prefix(ctx.message)
@@ -61,22 +116,10 @@ class HelpCog(commands.Cog, name="Help"):
                 color=color
             )
 
-            # Group commands by their top-level cog or categorize them as "Uncategorized".
-            categorized_commands: Dict[str, List[commands.Command]] = {}
-            for command in self.bot.walk_commands():
-                if command.hidden or command.cog_name == "Events":
-                    continue
-                if command.parent is not None:
-                    continue  # only show top-level in main view
-
-                cog_name = command.cog_name or "Uncategorized"
-                categorized_commands.setdefault(cog_name, []).append(command)
-
-            for cog_name in sorted(categorized_commands.keys()):
-                if cog_name == "Owner" and not is_bot_owner(ctx):
+            for cog_name, command_names in self.get_command_index():
+                if cog_name == "Owner" and not is_owner:
                     continue
-                commands_list = sorted(categorized_commands[cog_name], key=lambda c: c.name)
-                commands_display = [f"`{cmd.name}`" for cmd in commands_list]
+                commands_display = [f"`{command_name}`" for command_name in command_names]
                 if commands_display:
                     embed.add_field(name=cog_name, value=" ".join(commands_display), inline=False)
             embed.set_footer(text=ctx.author.display_name, icon_url=ctx.author.display_avatar.url)
@@ -86,7 +129,7 @@ class HelpCog(commands.Cog, name="Help"):
         # --- COG HELP ---
         if cog := self.bot.get_cog(name.capitalize()):
             if not (name.lower() == "events" or 
-                    (name.lower() == "owner" and not is_bot_owner(ctx))):
+                    (name.lower() == "owner" and not is_owner)):
                 embed = discord.Embed(
                     title=f"{cog.qualified_name} Commands",
                     description=cog.description or "No description available.",
@@ -39,17 +39,20 @@ class DropView(discord.ui.View):
         button.disabled = True
         if interaction.message:
             self.message = interaction.message
-            await interaction.message.edit(view=self)
+        # Acknowledge the click and disable the button in one call, before any slow database write can time the interaction out.
+        await interaction.response.edit_message(view=self)
 
         # Update the user's balance in the database.
         await update_user_balance(self.guild_id, interaction.user.id, self.amount, "money_drop_claim", "BOT")
-        formatted_amount = await format_currency(self.guild_id, self.amount)
+
+        config = await get_server_config(self.guild_id)
+        formatted_amount = format_currency_from_config(config, self.amount)
 
         # Send an ephemeral message confirming the claim to the user.
-        await interaction.response.send_message(f"You claimed {formatted_amount}!", ephemeral=True)
+        await interaction.followup.send(f"You claimed {formatted_amount}!", ephemeral=True)
 
-        if log_channel_id := (await get_server_config(self.guild_id)).get('economy', {}).get('log_channel'):
-            await post_money_log(self.bot, self.guild_id, log_channel_id, "money_drop_claim", self.amount, "BOT", interaction.user.id)
+        if log_channel_id := config.get('economy', {}).get('log_channel'):
+            run_in_background(post_money_log(self.bot, self.guild_id, log_channel_id, "money_drop_claim", self.amount, "BOT", interaction.user.id))
 
     async def on_timeout(self) -> None:
         """
@@ -2,16 +2,31 @@ import discord
 from discord.ext import commands
 from utils.supabase_client import get_server_with_update_feed
 from utils.helpers import *
+from config import get_logger
 import asyncio
 
+logger = get_logger()
+
+# Maximum number of update feed channels posted to at once
+UPDATE_FEED_CONCURRENCY = 10
+
 async def send_embed_to_feed(bot, embed) -> None:
     channels = await get_server_with_update_feed()
-    for channel_dict in channels:
+    semaphore = asyncio.Semaphore(UPDATE_FEED_CONCURRENCY)
+
+    async def post(channel_dict) -> None:
         channel = bot.get_channel(int(channel_dict["update_log"])) # type: ignore
         if channel and isinstance(channel, discord.TextChannel):
             guild_id = channel_dict.get("guild_id")
             if guild_id:
-                await channel.send(embed=embed)
+                async with semaphore:
+                    await channel.send(embed=embed)
+
+    # Post to every channel concurrently, so one failing channel doesn't stop the others.
+    results = await asyncio.gather(*(post(channel_dict) for channel_dict in channels), return_exceptions=True)
+    for channel_dict, result in zip(channels, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to post update to channel {channel_dict['update_log']} in guild {channel_dict['guild_id']}: {result}", exc_info=result)
 
 class OwnerCog(commands.Cog, name="Owner"):
     """
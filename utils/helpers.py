@@ -1,8 +1,10 @@
 import discord
 from discord.ext import commands
-from utils.supabase_client import get_server_config
-from typing import Optional, List, Union, Any
+from utils.supabase_client import get_server_config, ServerConfig, MONEY_DROP_FALLBACKS
+from typing import Optional, List, Set, Union, Any, Awaitable
+import asyncio
 import random
+from datetime import datetime, timedelta, timezone
 from core.tiktok import TikTokService
 from config import get_logger
 from rapidfuzz import fuzz
@@ -11,6 +13,7 @@ log = get_logger()
 
 DEFAULT_EMBED_COLOR = "#0000FF"  # Default blue color for embeds
 BOT_OWNERS = [1011944834669486142]
+RANDOM_MEMBER_ATTEMPTS = 20 # Random picks to try before filtering the whole member list
 ACTION_DICT = {
     "work": "work 💼",
     "steal_success": "theft successful 🦹‍♂️",
@@ -22,6 +25,23 @@ ACTION_DICT = {
     "money_drop_claim": "money drop claim 💸"
 }
 
+# Strong references to tasks started by `run_in_background`, so they aren't garbage collected mid-run.
+BACKGROUND_TASKS: Set[asyncio.Future] = set()
+
+def run_in_background(awaitable: Awaitable[Any]) -> None:
+    """
+    Schedules an awaitable (e.g. a log post) to run without waiting for it.
+    Any exception it raises is logged instead of being lost.
+    """
+    task = asyncio.ensure_future(awaitable)
+    BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_background_task_done)
+
+def _background_task_done(task: asyncio.Future) -> None:
+    BACKGROUND_TASKS.discard(task)
+    if not task.cancelled() and (error := task.exception()):
+        log.error(f"Background task failed: {error}", exc_info=error)
+
 async def post_money_log(bot: commands.Bot, guild_id: int, log_channel_id: Union[int, str], action: str, amount: int, type: str, user_id: int, target_user_id: Optional[int] = None):
     """Posts a formatted economy log to the specified channel."""
     if isinstance(log_channel_id, str):
@@ -100,11 +120,20 @@ async def get_embed_color(guild_id: Optional[Union[int, str]] = None) -> discord
 
     if guild_id:
         # Fetch server configuration. `get_server_config` handles defaults if no config exists.
-        server_config = await get_server_config(guild_id)
-        # Get the `embed_color` from the config, defaulting to "#0000FF" (blue) if not set.
-        hex_color: str = server_config.get('embed_color', DEFAULT_EMBED_COLOR)
-    else:
-        hex_color = DEFAULT_EMBED_COLOR  # Use default color if no guild ID is provided.
+        return get_embed_color_from_config(await get_server_config(guild_id))
+    return get_embed_color_from_config(None) # Use default color if no guild ID is provided.
+
+def get_embed_color_from_config(server_config: Optional[ServerConfig]) -> discord.Color:
+    """
+    Gets the embed color from an already loaded server config, without fetching it again.
+    Falls back to a default color if no config is given or if the set color is invalid.
+    Parameters:
+    - `server_config`: The guild's server config, or None for the default color.
+    Returns:
+    - A `discord.Color` object.
+    """
+    # Get the `embed_color` from the config, defaulting to "#0000FF" (blue) if not set.
+    hex_color: str = server_config.get('embed_color', DEFAULT_EMBED_COLOR) if server_config else DEFAULT_EMBED_COLOR
 
     try:
         # Convert hexadecimal string (e.g., "#RRGGBB") to an integer suitable for `discord.Color`.
@@ -125,7 +154,18 @@ async def format_currency(guild_id: int, amount: int, include_name: bool = False
     - A formatted string, e.g., "**£100 pounds**".
     """
     # Fetch server configuration to get economy settings.
-    config = await get_server_config(guild_id)
+    return format_currency_from_config(await get_server_config(guild_id), amount, include_name)
+
+def format_currency_from_config(config: ServerConfig, amount: int, include_name: bool = False) -> str:
+    """
+    Formats a given amount of currency using an already loaded server config, without fetching it again.
+    Use this over `format_currency` when formatting many amounts, e.g. a leaderboard page.
+    Parameters:
+    - `config`: The guild's server config.
+    - `amount`: The integer amount of currency.
+    Returns:
+    - A formatted string, e.g., "**£100 pounds**".
+    """
     # Access the 'economy' sub-dictionary, defaulting to an empty dict if it doesn't exist.
     economy_config = config.get('economy', {})
     # Get the currency symbol and name from economy config, with defaults.
@@ -141,6 +181,30 @@ async def format_currency(guild_id: int, amount: int, include_name: bool = False
     # Return the formatted string. Bold the symbol and amount.
     return f"**{symbol}{amount}**{(' ' + name) if include_name else ''}"
 
+def format_cooldown(remaining: timedelta) -> str:
+    """
+    Formats a remaining cooldown as hours, minutes and seconds, e.g. "1:05:09".
+    Hours are not rolled over into days, so a 30 hour cooldown reads "30:00:00".
+    """
+    minutes, seconds = divmod(int(remaining.total_seconds()), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}"
+
+def parse_utc_iso(timestamp: str) -> datetime:
+    """
+    Parses an ISO 8601 timestamp from the database into a timezone-aware UTC datetime.
+    Supabase returns UTC timestamps ending in '+00:00', which are parsed without a timezone conversion.
+    Parameters:
+    - `timestamp`: The ISO format string, e.g. "2025-01-01T12:00:00+00:00".
+    Returns:
+    - A `datetime` in UTC.
+    """
+    if timestamp.endswith('+00:00'):
+        return datetime.fromisoformat(timestamp) # Already aware and in UTC.
+    if timestamp.endswith('Z'):
+        return datetime.fromisoformat(timestamp[:-1]).replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(timestamp).astimezone(timezone.utc)
+
 async def send_embed(ctx: commands.Context, description: str, title: Optional[str] = None, image_url: Optional[str] = None) -> None:
     """
     Sends a standardized embed message to the context's channel.
@@ -168,11 +232,11 @@ async def get_user_from_arg(user_arg: Optional[Union[str, discord.Member]], ctx:
     if isinstance(user_arg, discord.Member):
         return user_arg
 
-    members = [m for m in list(ctx.guild.members) if not m.bot]
-    if not members:
-        raise Exception("How tf...")
-
     if isinstance(user_arg, str):
+        members = [m for m in ctx.guild.members if not m.bot]
+        if not members:
+            raise Exception("How tf...")
+
         matches = []
         for member in members:
             # Filter out any None names
@@ -195,25 +259,22 @@ async def get_user_from_arg(user_arg: Optional[Union[str, discord.Member]], ctx:
     if not random_if_invalid:
         raise Exception("Member not found.")
     
-    # Filter select a random member, excluding the command's author.
-    members: List[discord.Member] = [m for m in ctx.guild.members if not m.bot and m.id != ctx.author.id]
+    # Select a random member, excluding bots and the command's author.
+    # `guild.members` still copies the member list, but sampling and rejecting first means the common case 
+    # skips the filter pass (and the second, filtered list) over every member in the guild.
+    guild_members = ctx.guild.members
+    for _ in range(RANDOM_MEMBER_ATTEMPTS if guild_members else 0):
+        member = random.choice(guild_members)
+        if not member.bot and member.id != ctx.author.id:
+            return member
+
+    # The guild is mostly bots, so fall back to filtering the list.
+    members: List[discord.Member] = [m for m in guild_members if not m.bot and m.id != ctx.author.id]
     if not members:
         raise Exception("No non-bot members in the guild.")
     return random.choice(members) # Pick a random member.
 
 
-def guild_only():
-    """
-    A custom command check that ensures the command is used only within a guild.
-    If used in a DM, it sends an ephemeral message and prevents the command from running.
-    """
-    async def predicate(ctx):
-        if ctx.guild is None:
-            await ctx.author.send("This command can only be used in a server.")
-            return False
-        return True
-    return commands.check(predicate)
-
 async def channel_check(ctx: commands.Context, allowed_channels: List[str]):
     # If allowed_channels is empty, all channels are allowed.
     if not allowed_channels:
@@ -251,9 +312,9 @@ def in_moneydrop_channels():
         assert ctx.guild is not None
 
         server_config = await get_server_config(ctx.guild.id)
-        # Access moneydrop config, defaulting to an empty dict if not present
-        moneydrop_config = server_config.get('moneydrop', {})
-        allowed_channels = moneydrop_config.get('allowed_channels', [])
+        # Access moneydrop config, using the shared fallbacks for any missing settings
+        moneydrop_config = {**MONEY_DROP_FALLBACKS, **server_config.get('moneydrop', {})}
+        allowed_channels = moneydrop_config['allowed_channels']
 
         return await channel_check(ctx, allowed_channels)
     
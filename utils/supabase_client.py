@@ -1,7 +1,11 @@
-from supabase import create_client, Client
+import asyncio
+import httpx
+import time
+import weakref
+from supabase import create_client, Client, ClientOptions
 from config import config
 from datetime import datetime, timezone
-from typing import TypedDict, List, Optional, Literal, Any, Dict, cast, Tuple, Union
+from typing import TypedDict, Callable, List, Optional, Literal, Any, Dict, cast, Tuple, Union
 from copy import deepcopy
 from config import get_logger
 
@@ -61,6 +65,11 @@ class EconomyData(TypedDict):
     participant: bool              # If User has participated in the economy (used the bot)
     tiktok: TikTokData         # TikTok related data, e.g., username or link.
 
+class LeaderboardEntry(TypedDict):
+    """A row of a guild's leaderboard, the subset of 'economy' columns it needs."""
+    user_id: str                   # Discord user ID.
+    balance: int                   # User's current balance.
+
 class EconomyLog(TypedDict):
     """TypedDict for the 'economy_logs' table, tracking all economy transactions."""
     id: int                        # Unique log entry ID (auto-incrementing in DB).
@@ -73,12 +82,19 @@ class EconomyLog(TypedDict):
     timestamp: str                 # Timestamp of the transaction (ISO format string).
 
 class CachedData(TypedDict):
-    updated_at: datetime
+    updated_at: float              # time.monotonic() reading from when the entry was cached.
     data: Dict[str, Any]
 
 # Global Variables 
 
-supabase: Client = create_client(config.SUPABASE_URL, config.SUPABASE_KEY)
+# A single pooled HTTP client shared by every Supabase request, so connections are kept alive and reused.
+http_client = httpx.Client(
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+    timeout=10,
+    http2=True,
+    follow_redirects=True
+)
+supabase: Client = create_client(config.SUPABASE_URL, config.SUPABASE_KEY, options=ClientOptions(httpx_client=http_client))
 logger = get_logger()
 
 # Default Values 
@@ -90,6 +106,13 @@ DEFAULT_MONEY_DROP_CONFIG: MoneyDropConfig = {
     "max_amount": 150,
     "allowed_channels": ["-1"]
 }
+# What a stored config missing some money drop settings behaves as. Kept apart from DEFAULT_MONEY_DROP_CONFIG
+# (used for new guilds) so existing guilds keep their behaviour: drops in every channel, up to 250.
+MONEY_DROP_FALLBACKS: MoneyDropConfig = {
+    **DEFAULT_MONEY_DROP_CONFIG,
+    "max_amount": 250,
+    "allowed_channels": []
+}
 DEFAULT_ECONOMY_CONFIG: EconomyConfig = {
     "work_cooldown_hours": 1,
     "steal_cooldown_hours": 6,
@@ -112,11 +135,29 @@ DEFAULT_TIKTOK_DATA: TikTokData = {
 }
 
 SERVER_CONFIG_CACHE: Dict[str, CachedData] = {}
+SERVER_CONFIG_FETCHES: Dict[str, "asyncio.Future[ServerConfig]"] = {} # In-flight config fetches, keyed by guild ID.
+# Per-guild locks around config writes, keyed by guild ID. Weakly held, so a lock is dropped once nothing is using it.
+SERVER_CONFIG_LOCKS: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
 ECONOMY_CACHE: Dict[Tuple[str, str], CachedData] = {}
+ECONOMY_FETCHES: Dict[Tuple[str, str], "asyncio.Future[EconomyData]"] = {} # In-flight economy data fetches, keyed by (guild ID, user ID).
+# Per-user locks around economy writes, keyed by (guild ID, user ID). Weakly held, so a lock is dropped once nothing is using it.
+ECONOMY_LOCKS: "weakref.WeakValueDictionary[Tuple[str, str], asyncio.Lock]" = weakref.WeakValueDictionary()
 TTL = 60 * 10
 
 # General Functions 
 
+def get_lock(locks: "weakref.WeakValueDictionary[Any, asyncio.Lock]", key: Any) -> asyncio.Lock:
+    """Gets the lock for `key` from `locks`, creating it only if no one is currently holding or waiting on one."""
+    lock = locks.get(key)
+    if lock is None:
+        lock = locks[key] = asyncio.Lock()
+    return lock
+
+def close_http_client() -> None:
+    """Closes the pooled HTTP client used for Supabase requests. Called when the bot shuts down."""
+    http_client.close()
+
+
 def deep_merge(source: Dict[str, Any], destination: Dict[str, Any]) -> Dict[str, Any]:
     """Recursively merges two dictionaries.
     
@@ -182,7 +223,7 @@ def cache_upsert(table: str, data: Dict[Any, Any] = {}) -> None:
 
     if cache_key:
         logger.debug(f"Upserting to cache for table '{table}' with key '{cache_key}'.")
-        cache[cache_key] = {"updated_at": datetime.now(timezone.utc), "data": data} # type: ignore
+        cache[cache_key] = {"updated_at": time.monotonic(), "data": data} # type: ignore
     else:
         logger.debug(f"Cache miss for table '{table}'.")
 
@@ -205,7 +246,7 @@ def cache_retrieve(table: str, conditions:Dict[Any, Any]) -> Optional[List[Dict[
         return
     
     if cache_key and cache_key in cache:
-        if (datetime.now(timezone.utc) - cache[cache_key]["updated_at"]).total_seconds() < TTL: # type: ignore
+        if time.monotonic() - cache[cache_key]["updated_at"] < TTL: # type: ignore
             logger.debug(f"Retrieved from cache for table '{table}' with key '{cache_key}'.")
             return [cache[cache_key]["data"]] # type: ignore
         else:
@@ -300,9 +341,12 @@ def retrieve(table: str, conditions:Dict[Any, Any] = {}) -> List[Dict[Any, Any]]
     return data if data else []
 
 
-def update(table: str, attributes: Dict[Any, Any] = {}, conditions: Dict[Any, Any] = {}) -> None:
+def update(table: str, attributes: Dict[Any, Any] = {}, conditions: Dict[Any, Any] = {}) -> List[Dict[Any, Any]]:
     """Updates records in a Supabase table and refreshes the corresponding cache entries.
 
+    The update returns the updated rows, which are used to refresh the cache directly 
+    instead of fetching them again.
+
     Args:
         table (str): The name of the Supabase table.
         attributes (Dict[Any, Any], optional): A dictionary of the fields to update. 
@@ -312,6 +356,9 @@ def update(table: str, attributes: Dict[Any, Any] = {}, conditions: Dict[Any, An
 
     Raises:
         Exception: If the database update fails.
+
+    Returns:
+        List[Dict[Any, Any]]: The updated records.
     """
     logger.debug(f"Updating in Supabase for table '{table}' with conditions: {conditions}")
     # Attempt to update supabase
@@ -319,31 +366,21 @@ def update(table: str, attributes: Dict[Any, Any] = {}, conditions: Dict[Any, An
         query = supabase.table(table).update(attributes)
         for key, value in conditions.items():
             query = query.eq(key, value)
-        query.execute()
+        response = query.execute()
+        data = response.data or []
         logger.info(f"Successfully updated record in table '{table}'.")
     except Exception as e:
         logger.error(f"Failed to update records in table '{table}' with conditions {conditions}: {e}", exc_info=True)
         raise Exception(f"Failed to update records in {table}: {e}")
     
     logger.debug(f"Updating cache for table '{table}' after database update for conditions: {conditions}.")
-    # Retrieve the updated records from Supabase and upsert them into the cache
-    data = []
-    try:
-        query = supabase.table(table).select("*")
-        for key, value in conditions.items():
-            query = query.eq(key, value)
-        response = query.execute()
-        data = response.data
-        if data:
-            for record in data:
-                cache_upsert(table, record)
-        logger.info(f"Successfully updated cache for {len(data)} records in table '{table}'.")
-    except Exception as e:
-        logger.error(f"Cache update after DB update failed for table '{table}' with conditions {conditions}: {e}", exc_info=True)
-        if data:
-            logger.warning(f"Deleting cache entries for table '{table}' due to post-update cache failure. Conditions: {conditions}")
-            for record in data:
-                cache_delete(table, record)
+    if not data:
+        # Nothing came back to refresh the cache with, so drop the possibly stale entry.
+        cache_delete(table, conditions)
+    for record in data:
+        cache_upsert(table, record)
+    logger.info(f"Successfully updated cache for {len(data)} records in table '{table}'.")
+    return data
 
 
 def delete(table: str, conditions: Dict[Any, Any] = {}) -> None:
@@ -376,6 +413,8 @@ async def get_server_config(guild_id: int) -> ServerConfig:
     """Fetches a server's configuration, creating a default one if it doesn't exist.
 
     This function ensures that a valid configuration is always available for a guild.
+    Concurrent cache misses for the same guild share a single fetch instead of each 
+    querying Supabase.
 
     Args:
         guild_id (int): The Discord guild ID for which to fetch the configuration.
@@ -383,7 +422,36 @@ async def get_server_config(guild_id: int) -> ServerConfig:
     Returns:
         ServerConfig: The server's configuration dictionary.
     """
-    res = cast(List[ServerConfig], retrieve("server_configs",{"guild_id": guild_id}))
+    res = cast(Optional[List[ServerConfig]], cache_retrieve("server_configs", {"guild_id": guild_id}))
+    if res:
+        logger.debug(f"Found server config for guild_id {guild_id}.")
+        return res[0]
+
+    key = str(guild_id)
+    fetch = SERVER_CONFIG_FETCHES.get(key)
+    if fetch is None:
+        logger.debug(f"Starting server config fetch for guild_id {guild_id}.")
+        fetch = asyncio.ensure_future(_load_server_config(guild_id))
+        SERVER_CONFIG_FETCHES[key] = fetch
+        fetch.add_done_callback(lambda _: SERVER_CONFIG_FETCHES.pop(key, None))
+    else:
+        logger.debug(f"Joining in-flight server config fetch for guild_id {guild_id}.")
+    # Shield the shared fetch so one cancelled caller doesn't cancel it for the others.
+    return await asyncio.shield(fetch)
+
+async def _load_server_config(guild_id: int) -> ServerConfig:
+    """Loads a server's configuration from Supabase, creating a default one if it doesn't exist.
+
+    The blocking Supabase calls run in a worker thread so the event loop keeps serving 
+    other events while the fetch is in flight.
+
+    Args:
+        guild_id (int): The Discord guild ID for which to load the configuration.
+
+    Returns:
+        ServerConfig: The server's configuration dictionary.
+    """
+    res = cast(List[ServerConfig], await asyncio.to_thread(retrieve, "server_configs", {"guild_id": guild_id}))
     
     if res:
         data = res[0]
@@ -403,11 +471,32 @@ async def get_server_config(guild_id: int) -> ServerConfig:
             "config_log": None,
             "streamer": None
         }
-        create("server_configs", cast(Dict, data))
+        await asyncio.to_thread(create, "server_configs", cast(Dict, data))
     
     return data
 
-async def update_server_config(guild_id: int, data: Dict[str, Any]) -> None:
+async def warm_server_config_cache() -> int:
+    """Loads every server's configuration into the cache with a single query.
+
+    Called on startup so prefix and channel checks for each guild start as cache hits 
+    instead of each guild's first message waiting on Supabase.
+
+    Returns:
+        int: The number of configurations cached.
+    """
+    logger.debug("Warming server config cache.")
+    try:
+        response = await asyncio.to_thread(supabase.table("server_configs").select("*").execute)
+    except Exception as e:
+        logger.error(f"Failed to warm server config cache: {e}", exc_info=True)
+        return 0
+
+    for record in response.data:
+        cache_upsert("server_configs", record)
+    logger.info(f"Cached {len(response.data)} server configs.")
+    return len(response.data)
+
+async def update_server_config(guild_id: int, data: Dict[str, Any]) -> Optional[ServerConfig]:
     """Updates a server's configuration in Supabase.
 
     Handles partially updated configurations by performing a deep merge of the existing configuration
@@ -416,34 +505,109 @@ async def update_server_config(guild_id: int, data: Dict[str, Any]) -> None:
     Args:
         guild_id (int): The ID of the guild to update.
         data (Dict[str, Any]): A dictionary of fields to update and their new values. Should be a partial dict based on ServerConfig.
+
+    Returns:
+        Optional[ServerConfig]: The updated configuration as returned by the write, or None if nothing was updated.
     """
-    update_data: Dict[str, Any] = {}
     logger.info(f"Updating server config for guild_id {guild_id}.")
     logger.debug(f"Data:{data}")
 
+    # Writes for the same guild are serialized, so a merge never starts from a config another write is about to replace.
+    async with get_lock(SERVER_CONFIG_LOCKS, str(guild_id)):
+        return await _write_server_config(guild_id, data)
+
+async def modify_server_config(guild_id: int, modify: Callable[[ServerConfig], Dict[str, Any]]) -> Tuple[ServerConfig, Dict[str, Any]]:
+    """Updates a server's configuration based on its current value.
+
+    Use this over `update_server_config` when the new values are derived from the old ones (e.g. toggling 
+    a channel in a list), or when the caller needs the exact config the update replaced (e.g. to log a diff). Reading the config, calling `modify` and writing the result all happen under the 
+    guild's write lock, so a concurrent write can't land in between and be overwritten.
+
+    Args:
+        guild_id (int): The ID of the guild to update.
+        modify (Callable[[ServerConfig], Dict[str, Any]]): Given the current configuration, returns the 
+            fields to update, as they would be passed to `update_server_config`.
+
+    Returns:
+        Tuple[ServerConfig, Dict[str, Any]]: The configuration before the update, and the fields `modify` returned.
+    """
+    logger.info(f"Modifying server config for guild_id {guild_id}.")
+
+    async with get_lock(SERVER_CONFIG_LOCKS, str(guild_id)):
+        current_config = await get_server_config(guild_id)
+        data = modify(current_config)
+        logger.debug(f"Data:{data}")
+        await _write_server_config(guild_id, data, current_config)
+    return current_config, data
+
+async def _write_server_config(guild_id: int, data: Dict[str, Any], current_config: Optional[ServerConfig] = None) -> Optional[ServerConfig]:
+    """Merges `data` into a server's configuration and writes it. Must be called with the guild's write lock held.
+
+    Args:
+        guild_id (int): The ID of the guild to update.
+        data (Dict[str, Any]): A dictionary of fields to update and their new values.
+        current_config (Optional[ServerConfig], optional): The current configuration, if already loaded. 
+            Fetched when a section needs merging otherwise. Defaults to None.
+
+    Returns:
+        Optional[ServerConfig]: The updated configuration as returned by the write, or None if nothing was updated.
+    """
+    update_data: Dict[str, Any] = {}
     for key, value in data.items():
         if key in ("economy", "moneydrop"):
+            if not isinstance(value, dict):
+                continue
             logger.debug(f"Performing deep merge for '{key}' on guild_id {guild_id}")
-            current_config = await get_server_config(guild_id) # Fetch current config to merge changes.
-            if key == "economy" and isinstance(value, dict):
-                # If the 'economy' key is being updated, perform a deep merge.
-                eco_settings_copy = deepcopy(cast(Dict[str, Any],current_config['economy']))
-                update_data['economy'] = deep_merge(value, eco_settings_copy)
-            elif key == "moneydrop" and isinstance(value, dict):
-                # If the 'moneydrop' key is being updated, perform a deep merge.
-                moneydrop_copy = deepcopy(cast(Dict[str, Any], current_config['moneydrop']))
-                update_data['moneydrop'] = deep_merge(value, moneydrop_copy)
+            if current_config is None:
+                # Fetch the current config once per update (usually a cache hit) to merge changes into.
+                current_config = await get_server_config(guild_id)
+            section_copy = deepcopy(cast(Dict[str, Any], current_config[key]))
+            update_data[key] = deep_merge(value, section_copy)
         else:
             update_data[key] = value
 
-    if update_data:
-        update_data["guild_id"] = str(guild_id)
-        update("server_configs", update_data, {"guild_id": guild_id})
+    if not update_data:
+        return None
+    update_data["guild_id"] = str(guild_id)
+    rows = await asyncio.to_thread(update, "server_configs", update_data, {"guild_id": guild_id})
+    return cast(ServerConfig, rows[0]) if rows else None
 
 async def get_user_economy_data(guild_id: int, user_id: int) -> EconomyData:
     """Fetches a user's economy data, creating a default entry if it doesn't exist.
 
-    Ensures every user has an economy profile within a guild.
+    Ensures every user has an economy profile within a guild. Cached profiles are returned 
+    directly. Concurrent cache misses for the same user share a single fetch, so two commands 
+    from a new user can't both miss the row and both try to create it.
+
+    Args:
+        guild_id (int): The Discord guild ID.
+        user_id (int): The Discord user ID.
+
+    Returns:
+        EconomyData: The user's economy data dictionary.
+    """
+    res = cast(Optional[List[EconomyData]], cache_retrieve("economy", {"guild_id": guild_id, "user_id": user_id}))
+    if res:
+        logger.debug(f"Found economy data for user {user_id} in guild {guild_id}.")
+        return res[0]
+
+    key = (str(guild_id), str(user_id))
+    fetch = ECONOMY_FETCHES.get(key)
+    if fetch is None:
+        logger.debug(f"Starting economy data fetch for user {user_id} in guild {guild_id}.")
+        fetch = asyncio.ensure_future(_load_user_economy_data(guild_id, user_id))
+        ECONOMY_FETCHES[key] = fetch
+        fetch.add_done_callback(lambda _: ECONOMY_FETCHES.pop(key, None))
+    else:
+        logger.debug(f"Joining in-flight economy data fetch for user {user_id} in guild {guild_id}.")
+    # Shield the shared fetch so one cancelled caller doesn't cancel it for the others.
+    return await asyncio.shield(fetch)
+
+async def _load_user_economy_data(guild_id: int, user_id: int) -> EconomyData:
+    """Loads a user's economy data from Supabase, creating a default entry if it doesn't exist.
+
+    The blocking Supabase calls run in a worker thread so the event loop keeps serving 
+    other events while the fetch is in flight.
 
     Args:
         guild_id (int): The Discord guild ID.
@@ -452,7 +616,7 @@ async def get_user_economy_data(guild_id: int, user_id: int) -> EconomyData:
     Returns:
         EconomyData: The user's economy data dictionary.
     """
-    res = cast(List[EconomyData], retrieve("economy",{"guild_id": guild_id, "user_id": user_id}))
+    res = cast(List[EconomyData], await asyncio.to_thread(retrieve, "economy", {"guild_id": guild_id, "user_id": user_id}))
     
     if res:
         data = res[0]
@@ -471,7 +635,7 @@ async def get_user_economy_data(guild_id: int, user_id: int) -> EconomyData:
             'participant': False,
             'tiktok': DEFAULT_TIKTOK_DATA
         }
-        create("economy", cast(Dict, data))
+        await asyncio.to_thread(create, "economy", cast(Dict, data))
     
     return data
 
@@ -506,7 +670,7 @@ async def get_multiple_user_economy_data(guild_id: int, user_ids: List[int] = []
         res = supabase.table('economy').select("*").eq('guild_id', str(guild_id))
         if user_ids_to_fetch:
             res = res.in_('user_id', [str(uid) for uid in user_ids_to_fetch])
-        res = res.execute()
+        res = await asyncio.to_thread(res.execute)
 
         if res and res.data:
             logger.info(f"Found {len(res.data)} economy data")
@@ -518,11 +682,30 @@ async def get_multiple_user_economy_data(guild_id: int, user_ids: List[int] = []
     logger.warning(f"No economy data found for user_ids {user_ids} in guild_id {guild_id}.")
     return []
 
+async def get_leaderboard_entries(guild_id: int) -> List[LeaderboardEntry]:
+    """Fetches a guild's leaderboard, sorted by balance from highest to lowest.
+
+    Only the columns the leaderboard shows are selected, and the sort runs in the database. 
+    Users who have never taken part in the economy are filtered out there too, using the participant flag.
+    The rows are partial, so they bypass the economy cache.
+
+    Args:
+        guild_id (int): The Discord guild ID.
+
+    Returns:
+        List[LeaderboardEntry]: The guild's participating users, in descending order of balance.
+    """
+    logger.debug(f"Fetching leaderboard for guild_id {guild_id}.")
+    query = supabase.table('economy').select("user_id, balance").eq('guild_id', str(guild_id)).eq('participant', True).order('balance', desc=True)
+    response = await asyncio.to_thread(query.execute)
+    return cast(List[LeaderboardEntry], response.data or [])
+
 async def update_user_economy(guild_id: int, user_id: int, data: Dict[str, Any]) -> None:
     """Updates a user's economy data in Supabase.
 
     Handles partially updated configurations by performing a deep merge of the existing configuration
-    with the provided data.
+    with the provided data. Takes the user's economy lock, so the write can't interleave with a balance change 
+    and leave an older balance in the cache.
 
     Args:
         guild_id (int): The ID of the guild.
@@ -531,6 +714,17 @@ async def update_user_economy(guild_id: int, user_id: int, data: Dict[str, Any])
     """
     logger.info(f"Updating user economy for user_id {user_id} in guild_id {guild_id}.")
     logger.debug(f"Data: {data}")
+    async with get_lock(ECONOMY_LOCKS, (str(guild_id), str(user_id))):
+        await _write_user_economy(guild_id, user_id, data)
+
+async def _write_user_economy(guild_id: int, user_id: int, data: Dict[str, Any]) -> None:
+    """Merges `data` into a user's economy data and writes it. Must be called with the user's economy lock held.
+
+    Args:
+        guild_id (int): The ID of the guild.
+        user_id (int): The ID of the user.
+        data (Dict[str, Any]): A dictionary of fields to update and their new values.
+    """
     update_data: Dict[str, Any] = {}
 
     for key, value in data.items():
@@ -544,9 +738,15 @@ async def update_user_economy(guild_id: int, user_id: int, data: Dict[str, Any])
             update_data[key] = value
     
     if update_data:
-        update("economy", update_data, {"guild_id": guild_id, "user_id": user_id})
+        await asyncio.to_thread(update, "economy", update_data, {"guild_id": guild_id, "user_id": user_id})
+
+class InsufficientFundsError(Exception):
+    """Raised by `update_user_balance` when a change would take a user's balance below zero."""
+    def __init__(self, balance: int) -> None:
+        super().__init__(f"Insufficient funds, balance is {balance}.")
+        self.balance = balance # The user's balance at the time of the attempted change.
 
-async def update_user_balance(guild_id: int, user_id: int, change: int, action: str, type: Literal["BOT", "USER", "TIKTOK"], target_user_id: Optional[int] = None) -> int:
+async def update_user_balance(guild_id: int, user_id: int, change: int, action: str, type: Literal["BOT", "USER", "TIKTOK"], target_user_id: Optional[int] = None, extra_data: Optional[Dict[str, Any]] = None, require_funds: bool = False) -> int:
     """Updates a user's balance and logs the transaction.
 
     This is the primary function for any balance modification, ensuring data 
@@ -560,17 +760,28 @@ async def update_user_balance(guild_id: int, user_id: int, change: int, action:
         type (Literal["BOT", "USER", "TIKTOK"]): The initiator of the action.
         target_user_id (Optional[int], optional): The ID of another user involved in 
             the transaction (e.g., the target of a steal). Defaults to None.
+        extra_data (Optional[Dict[str, Any]], optional): Other economy fields to set in the 
+            same write as the balance (e.g., a cooldown timestamp). Defaults to None.
+        require_funds (bool, optional): Whether to refuse a change that would take the balance 
+            below zero. Checked under the user's economy lock. Defaults to False.
 
     Returns:
         int: The user's new balance after the update.
+
+    Raises:
+        InsufficientFundsError: If `require_funds` is set and the balance can't cover the change.
     """
     logger.info(f"Updating balance for user_id {user_id} in guild_id {guild_id}.")
     logger.debug (f"Change: {change}, Action: {action}, Type: {type}, Target: {target_user_id}")
-    user_data = await get_user_economy_data(guild_id, user_id) # Ensure user exists.
-    current_balance = user_data.get('balance', 0)
-    new_balance = current_balance + change
-
-    await update_user_economy(guild_id, user_id, {'balance': new_balance, 'participant': True}) # Update balance in 'economy' table.
+    # Writes to the same user's economy data are serialized, so concurrent changes can't read the same balance and overwrite each other.
+    async with get_lock(ECONOMY_LOCKS, (str(guild_id), str(user_id))):
+        user_data = await get_user_economy_data(guild_id, user_id) # Ensure user exists.
+        current_balance = user_data.get('balance', 0)
+        new_balance = current_balance + change
+        if require_funds and new_balance < 0:
+            raise InsufficientFundsError(current_balance)
+
+        await _write_user_economy(guild_id, user_id, {**(extra_data or {}), 'balance': new_balance, 'participant': True}) # Update balance in 'economy' table.
     # Log the transaction details.
     await log_economy_action(guild_id, user_id, action, change, type, target_user_id)
     logger.info(f"New balance for user_id {user_id} in guild_id {guild_id}")
@@ -607,7 +818,7 @@ async def log_economy_action(guild_id: int, user_id: int, action: str, amount: i
     logger.info(f"Logging economy action for guild_id {guild_id}")
     logger.debug(f"Data: {data}")
     try:
-        supabase.table('economy_logs').insert(data).execute()
+        await asyncio.to_thread(supabase.table('economy_logs').insert(data).execute)
         logger.info(f"Successfully logged economy action for guild_id {guild_id}.")
     except Exception as e:
         logger.error(f"Failed to log economy action to 'economy_logs' table. Data: {data}. Error: {e}", exc_info=True)
@@ -622,7 +833,7 @@ async def get_server_with_update_feed() -> List[ServerConfig]:
     """
     logger.info("Fetching all server configs to find update feeds.")
     try:
-        response = supabase.table('server_configs').select("*").execute()
+        response = await asyncio.to_thread(supabase.table('server_configs').select("*").execute)
         if response and response.data:
             for record in response.data:
                 cache_upsert("server_configs", record)